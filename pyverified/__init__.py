@@ -1,6 +1,10 @@
-from pyverified.exc import ValidationError
+from pyverified.exc import ValidationError, ValidationTimeout
 from pyverified.msg import message
-from pyverified.verify.type_ import Str, Int, Float, Bool, DateTime, Date, Dict, List, Email, IPv4, IPv6, Phone, Addr
+from pyverified.verify.type_ import Str, Int, Float, Bool, DateTime, Date, Dict, List, Email, IPv4, IPv6, Phone, Addr, \
+    OneOf, When
+from pyverified.verify.lazy import LazyParams
+from pyverified.verify.sample import Sampler
+from pyverified.verify.serialize import iter_ndjson
 from pyverified.verify.verify import Verify
 
 
@@ -19,6 +23,8 @@ class _Rule:
     ipv6 = IPv6
     phone = Phone
     addr = Addr
+    oneof = OneOf
+    when = When
 
 
 rule = _Rule
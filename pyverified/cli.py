@@ -0,0 +1,249 @@
+"""Validate NDJSON or CSV files from the command line.
+
+    python -m pyverified myapp.schemas:order orders.ndjson -o valid.ndjson
+
+The input is memory-mapped and split into line-aligned chunks that are
+verified by a pool of worker processes. Valid records are written as
+NDJSON, rejected ones to a rejects file with their line number, error and
+raw line. A progress line and a summary are written to stderr.
+"""
+import argparse
+import csv
+import importlib
+import json
+import mmap
+import os
+import sys
+import time
+from multiprocessing import Pool
+from typing import List, Optional, Tuple
+
+from pyverified import Verify, ValidationError, message
+
+# State of a worker process, set by _init.
+_worker = {}
+
+# Errors of a record rejected instead of stopping the run, custom functions
+# and type conversions may raise the built-in ones.
+_record_errors = (ValidationError, TypeError, ValueError)
+
+
+class MultilineField(Exception):
+    """A quoted CSV field holds a line break, which line-aligned chunks cannot split."""
+
+    def __init__(self, number: int):
+        super().__init__(number)
+        self.number = number
+
+
+def load_schema(path: str):
+    """Load the rules named by ``"package.module:attribute"``."""
+    module_name, _, attribute = path.partition(':')
+    if not module_name or not attribute:
+        raise ValueError(f'Schema {path!r} must look like "package.module:attribute".')
+    rules = importlib.import_module(module_name)
+    for name in attribute.split('.'):
+        rules = getattr(rules, name)
+    return rules
+
+
+def split_chunks(mm, start: int, chunk_size: int) -> List[Tuple[int, int]]:
+    """Split the bytes from start into chunks ending at a line break."""
+    chunks = []
+    size = len(mm)
+    while start < size:
+        end = mm.find(b'\n', min(start + chunk_size, size) - 1)
+        end = size if end == -1 else end + 1
+        chunks.append((start, end))
+        start = end
+    return chunks
+
+
+def _init(schema: str, path: str, fmt: str, fieldnames: Optional[list], trusted: bool, english: bool):
+    if english:
+        message.english()
+    _worker['rules'] = load_schema(schema)
+    _worker['fmt'] = fmt
+    _worker['fieldnames'] = fieldnames
+    _worker['trusted'] = trusted
+    with open(path, 'rb') as fp:
+        _worker['mm'] = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _parse_line(line: bytes, number: int):
+    if _worker['fmt'] == 'csv':
+        try:
+            row = next(csv.reader([line.decode('utf-8')], strict=True))
+        except csv.Error:
+            # A quoted field is still open at the end of the line.
+            raise MultilineField(number)
+        fieldnames = _worker['fieldnames']
+        if len(row) != len(fieldnames):
+            raise ValueError(f'Expected {len(fieldnames)} columns, got {len(row)}.')
+        return dict(zip(fieldnames, row))
+    return json.loads(line)
+
+
+def _verify_chunk(chunk: Tuple[int, int]):
+    """Verify the lines of a chunk.
+
+    Returns the number of lines and records, the NDJSON of the valid records
+    and the rejects as (line number in the chunk, error, raw line).
+    """
+    start, end = chunk
+    rules, trusted = _worker['rules'], _worker['trusted']
+    lines = _worker['mm'][start:end].split(b'\n')
+    if not lines[-1]:
+        lines.pop()
+
+    records, numbers, rejects = [], [], []
+    for number, line in enumerate(lines):
+        if not line.strip():
+            continue
+        try:
+            records.append(_parse_line(line, number))
+        except ValueError as e:
+            rejects.append((number, str(e), line.decode('utf-8', 'replace')))
+            continue
+        numbers.append(number)
+
+    count = len(records) + len(rejects)
+
+    # Verify the whole chunk at once, and record by record only when it fails.
+    try:
+        valid = Verify(records, rules, many=True, output='json', trusted=trusted).params
+    except _record_errors:
+        valid = []
+        for number, record in zip(numbers, records):
+            try:
+                valid.append(Verify(record, rules, output='json', trusted=trusted).params + b'\n')
+            except _record_errors as e:
+                error = e.msg if isinstance(e, ValidationError) else f'{type(e).__name__}: {e}'
+                rejects.append((number, error, lines[number].decode('utf-8', 'replace')))
+        valid = b''.join(valid)
+        rejects.sort()
+    return len(lines), count, valid, rejects
+
+
+class Progress:
+    """Write the progress and the summary of a run to stderr."""
+
+    def __init__(self, total: int, quiet: bool = False):
+        self.total = total
+        self.quiet = quiet
+        self.done = 0
+        self.records = 0
+        self.rejected = 0
+        self.started = time.monotonic()
+        self.shown = self.started
+
+    def update(self, size: int, records: int, rejected: int):
+        self.done += size
+        self.records += records
+        self.rejected += rejected
+        now = time.monotonic()
+        if self.quiet or now - self.shown < 0.5:
+            return
+        self.shown = now
+        percent = self.done * 100 / self.total if self.total else 100
+        sys.stderr.write(f'\r{percent:5.1f}% {self.records} records, {self.rejected} rejected, '
+                         f'{self.records / max(now - self.started, 1e-9):.0f} records/s')
+        sys.stderr.flush()
+
+    def summary(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        if not self.quiet and self.shown:
+            sys.stderr.write('\n')
+        sys.stderr.write(
+            f'{self.records} records, {self.records - self.rejected} valid, {self.rejected} rejected '
+            f'in {elapsed:.2f}s ({self.records / elapsed:.0f} records/s, '
+            f'{self.done / elapsed / 1024 / 1024:.1f} MiB/s)\n')
+
+
+def parse_args(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(prog='python -m pyverified', description='Validate NDJSON or CSV files.')
+    parser.add_argument('schema', help='rules to apply, as "package.module:attribute"')
+    parser.add_argument('input', help='NDJSON or CSV file to validate')
+    parser.add_argument('-f', '--format', choices=('ndjson', 'csv'),
+                        help='input format, guessed from the file extension by default')
+    parser.add_argument('-o', '--output', default='-', help='NDJSON file of the valid records, "-" for stdout')
+    parser.add_argument('-r', '--rejects', help='NDJSON file of the rejected lines, INPUT.rejects.ndjson by default')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1, help='number of worker processes')
+    parser.add_argument('--chunk-size', type=int, default=4 * 1024 * 1024, help='bytes per chunk')
+    parser.add_argument('--trusted', action='store_true', help='only apply default values and type conversion')
+    parser.add_argument('--english', action='store_true', help='report errors in English')
+    parser.add_argument('-q', '--quiet', action='store_true', help='do not show the progress')
+    args = parser.parse_args(argv)
+    if args.format is None:
+        args.format = 'csv' if args.input.lower().endswith('.csv') else 'ndjson'
+    if args.rejects is None:
+        args.rejects = args.input + '.rejects.ndjson'
+    if args.workers < 1 or args.chunk_size < 1:
+        parser.error('workers and chunk-size must be positive integers.')
+    return args
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Run the validator.
+
+    The exit status is 1 when a line was rejected and 2 when the run could
+    not complete.
+    """
+    args = parse_args(argv)
+    if args.english:
+        message.english()
+    try:
+        load_schema(args.schema)
+    except (ImportError, AttributeError, ValueError) as e:
+        sys.stderr.write(f'Cannot load the schema {args.schema!r}: {e}\n')
+        return 2
+
+    with open(args.input, 'rb') as fp:
+        size = os.fstat(fp.fileno()).st_size
+        mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+    # The CSV header is read once and handed to the workers.
+    start, line_offset, fieldnames = 0, 0, None
+    if args.format == 'csv' and size:
+        end = mm.find(b'\n')
+        end = size if end == -1 else end + 1
+        fieldnames = next(csv.reader([mm[:end].decode('utf-8-sig')]), [])
+        start, line_offset = end, 1
+    chunks = split_chunks(mm, start, args.chunk_size) if size else []
+
+    initargs = (args.schema, args.input, args.format, fieldnames, args.trusted, args.english)
+    pool = None
+    if len(chunks) > 1 and args.workers > 1:
+        pool = Pool(min(args.workers, len(chunks)), initializer=_init, initargs=initargs)
+        results = pool.imap(_verify_chunk, chunks)
+    else:
+        if chunks:
+            _init(*initargs)
+        results = map(_verify_chunk, chunks)
+
+    progress = Progress(size, args.quiet)
+    progress.update(start, 0, 0)
+    output = sys.stdout.buffer if args.output == '-' else open(args.output, 'wb')
+    try:
+        with open(args.rejects, 'w', encoding='utf-8') as rejects:
+            for (chunk_start, chunk_end), (lines, records, valid, rejected) in zip(chunks, results):
+                output.write(valid)
+                for number, error, raw in rejected:
+                    reject = {'line': line_offset + number + 1, 'error': error, 'raw': raw}
+                    rejects.write(json.dumps(reject, ensure_ascii=False) + '\n')
+                line_offset += lines
+                progress.update(chunk_end - chunk_start, records, len(rejected))
+    except MultilineField as e:
+        sys.stderr.write(f'\nLine {line_offset + e.number + 1} starts a quoted CSV field holding a line break, '
+                         f'multi-line fields are not supported.\n')
+        return 2
+    finally:
+        if pool is not None:
+            pool.terminate()
+        if output is sys.stdout.buffer:
+            output.flush()
+        else:
+            output.close()
+
+    progress.summary()
+    return 1 if progress.rejected else 0
@@ -3,3 +3,17 @@ class ValidationError(Exception):
 
     def __init__(self, msg: str):
         self.msg = msg
+
+
+class ValidationTimeout(ValidationError):
+    """Verification exceeded its time or operation budget.
+
+    records is the number of records verified before it stopped, ops the
+    number of fields and elapsed the seconds spent.
+    """
+
+    def __init__(self, msg: str, records: int = 0, ops: int = 0, elapsed: float = 0.0):
+        super().__init__(msg)
+        self.records = records
+        self.ops = ops
+        self.elapsed = elapsed
@@ -0,0 +1,28 @@
+import time
+from typing import Any, Callable, Optional, Union
+
+
+def request_options(
+        deadline: Union[float, Callable[[Any], Optional[float]], None],
+        trusted: bool,
+        max_ops: Optional[int],
+        arg: Any) -> Callable[[], dict]:
+    """Make the function giving the Verify options of each check of a request.
+
+    All the checks of a request share one time budget: the deadline, or the
+    seconds it derives from ``arg`` when it is a function, starts when this
+    is called and every check gets the time that remains.
+
+    :param deadline: Seconds the checks may take, or a function of ``arg``.
+    :param trusted: Only apply default values and type conversion.
+    :param max_ops: Maximum number of fields verified by each check.
+    :param arg: The request, or the ASGI scope, handed to a deadline function.
+    """
+    seconds = deadline(arg) if callable(deadline) else deadline
+    end = None if seconds is None else time.monotonic() + seconds
+
+    def options() -> dict:
+        remaining = None if end is None else end - time.monotonic()
+        return dict(trusted=trusted, deadline=remaining, max_ops=max_ops)
+
+    return options
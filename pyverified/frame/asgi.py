@@ -0,0 +1,153 @@
+import json as pyjson
+from dataclasses import dataclass
+from typing import Optional, Union, Callable, Dict as Dic
+from urllib.parse import parse_qsl
+
+from pyverified import Verify, ValidationError, ValidationTimeout, msg
+from pyverified.frame._budget import request_options
+from pyverified.frame.fastapi import Params
+
+
+@dataclass
+class Route:
+    # query: Validation rules for query string parameters.
+    # json: Validation rules for JSON parameters.
+    # headers: Request headers check rule.
+    # many: Used in conjunction with the defined JSON validation rules.
+    # max_depth/max_total_nodes: Limits the size of the JSON parameters.
+    # trusted: Only apply default values and type conversion.
+    # deadline: Seconds all the checks of a request may take, or a function
+    # deriving them from the ASGI scope.
+    # max_ops: Maximum number of fields verified by each check.
+    query: Optional[dict] = None
+    json: Optional[dict] = None
+    headers: Optional[dict] = None
+    many: bool = False
+    max_depth: Optional[int] = None
+    max_total_nodes: Optional[int] = None
+    trusted: bool = False
+    deadline: Union[float, Callable[[dict], Optional[float]], None] = None
+    max_ops: Optional[int] = None
+
+
+class VerifyMiddleware:
+    """Parameter check middleware for any ASGI application.
+
+    Routes are matched on ``"METHOD /path"`` first and then on ``"/path"``.
+    The request body is only read for routes with JSON rules; it is counted
+    while it is being received, so an oversized upload is rejected as soon
+    as it crosses ``max_body_size`` instead of after it has been buffered.
+    Requests that pass are forwarded with the body replayed to the app and
+    the verified values stored in ``scope["state"]["params"]``, which is
+    where starlette and fastapi read ``request.state.params`` from.
+    """
+
+    def __init__(self, app, routes: Dic[str, Route], *, max_body_size: Optional[int] = None):
+        self.app = app
+        self.routes = routes
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        route = self.routes.get(f"{scope['method']} {scope['path']}") or self.routes.get(scope['path'])
+        if route is None:
+            return await self.app(scope, receive, send)
+
+        state = scope.setdefault('state', {})
+        params = state.get('params')
+        if not (params and isinstance(params, Params)):
+            params = Params()
+
+        # Share one time budget between all the checks of the request.
+        options = request_options(route.deadline, route.trusted, route.max_ops, scope)
+
+        try:
+            # json
+            if route.json:
+                body = await self.read_body(scope, receive)
+                if body is None:
+                    return
+                receive = self.replay(body, receive)
+                try:
+                    data = pyjson.loads(body) if body else {}
+                except (pyjson.JSONDecodeError, UnicodeDecodeError):
+                    data = {}
+                verified = Verify(
+                    data=data, rules=route.json, many=route.many,
+                    max_depth=route.max_depth, max_total_nodes=route.max_total_nodes, **options())
+                params.json = verified.params
+
+            # query
+            if route.query:
+                data = dict(parse_qsl(scope.get('query_string', b'').decode('latin-1'), keep_blank_values=True))
+                verified = Verify(data=data, rules=route.query, **options())
+                params.query = verified.params
+
+            # header
+            if route.headers:
+                data = {k.decode('latin-1'): v.decode('latin-1') for k, v in scope.get('headers', [])}
+                verified = Verify(data=data, rules=route.headers, **options())
+                params.headers = verified.params
+        except _BodyTooLarge as e:
+            return await self.send_error(send, 413, e)
+        except ValidationTimeout as e:
+            return await self.send_error(send, 503, e)
+        except ValidationError as e:
+            return await self.send_error(send, 400, e)
+
+        # Pass the verified value using the scope state.
+        state['params'] = params
+        return await self.app(scope, receive, send)
+
+    async def read_body(self, scope, receive) -> Optional[bytes]:
+        """Receive the whole body, stopping as soon as it exceeds the size limit."""
+        limit = self.max_body_size
+        if limit is not None:
+            for name, value in scope.get('headers', []):
+                if name == b'content-length' and value.isdigit() and int(value) > limit:
+                    raise _BodyTooLarge(msg.message.body_size.format(size=limit))
+
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if limit is not None and size > limit:
+                raise _BodyTooLarge(msg.message.body_size.format(size=limit))
+            chunks.append(chunk)
+            more_body = message.get('more_body', False)
+        return b''.join(chunks)
+
+    @staticmethod
+    def replay(body: bytes, receive):
+        """Hand the already received body to the app, then defer to the server."""
+        sent = False
+
+        async def inner():
+            nonlocal sent
+            if sent:
+                return await receive()
+            sent = True
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+
+        return inner
+
+    async def send_error(self, send, status: int, error: ValidationError):
+        """Respond with the failure message, override it to change the format."""
+        body = pyjson.dumps({'error': error.msg}).encode('utf-8')
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+
+class _BodyTooLarge(ValidationError):
+    """The request body is larger than the configured limit."""
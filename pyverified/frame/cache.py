@@ -0,0 +1,133 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+from pyverified.verify.base import RuleBase
+from pyverified.verify._fingerprint import copy_containers
+from pyverified.verify.type_ import Dict, List, OneOf, When
+
+_missing = object()
+
+
+def pure(func: Callable) -> Callable:
+    """Mark a custom function as pure: its result only depends on its arguments.
+
+    Results of rules whose ``func`` or ``batch_func`` are not all marked
+    pure are never cached, since they may read a database, the clock, etc.
+    """
+    func.__pure__ = True
+    return func
+
+
+def is_pure(rules: Any) -> bool:
+    """Whether every custom function of the rules is marked pure."""
+    if rules is None:
+        return True
+    if isinstance(rules, dict):
+        return all(is_pure(rule) for rule in rules.values())
+    if isinstance(rules, When):
+        return is_pure(rules.rule)
+    if isinstance(rules, OneOf):
+        return all(is_pure(subset) for subset in rules.choices.values())
+    if isinstance(rules, (Dict, List)):
+        return is_pure(rules.subset)
+    if isinstance(rules, RuleBase):
+        funcs = getattr(rules, 'func', None) or []
+        if not isinstance(funcs, list):
+            funcs = [funcs]
+        batch_func = getattr(rules, 'batch_func', None)
+        if batch_func:
+            funcs = funcs + [batch_func]
+        return all(getattr(func, '__pure__', False) for func in funcs)
+    return True
+
+
+def rule_keys(rules: Any) -> Tuple[str, ...]:
+    """Keys of the data read by top level rules."""
+    if isinstance(rules, OneOf):
+        keys = {rules.discriminator: None}
+        for subset in rules.choices.values():
+            keys.update(dict.fromkeys(subset))
+        return tuple(keys)
+    return tuple(rules or ())
+
+
+class ResultCache:
+    """Bounded LRU cache of verified query and header parameters.
+
+    A hit returns a copy of the dicts and lists of the stored result, so the
+    view function may change it freely. ``hits`` and ``misses`` count the
+    lookups; the cache is safe to share between threads.
+
+    :param maxsize: Maximum number of results kept.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValueError('maxsize must be a positive integer.')
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def build(cls, cache: Any, rules: Iterable[Any]) -> Optional['ResultCache']:
+        """Resolve the ``cache`` option of a decorator.
+
+        :param cache: None, the maximum number of results or a ResultCache.
+        :param rules: Rules whose results are cached, caching is disabled if
+            one of them is not pure.
+        """
+        if cache is None or cache is False:
+            return None
+        if not all(is_pure(rule) for rule in rules):
+            return None
+        if isinstance(cache, ResultCache):
+            return cache
+        return cls(cache)
+
+    @staticmethod
+    def make_key(namespace: Any, query_string: Any, headers: Any, keys: Tuple[str, ...]) -> tuple:
+        """Key made of the raw query string and the values of the checked headers.
+
+        :param namespace: Token of the decorator storing the result, so that
+            decorators sharing a cache never read each other's results.
+        """
+        return namespace, query_string, tuple(headers.get(key) for key in keys)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self.lock:
+            value = self.data.get(key, _missing)
+            if value is _missing:
+                self.misses += 1
+                return default
+            self.data.move_to_end(key)
+            self.hits += 1
+        return copy_containers(value)
+
+    def put(self, key: Any, value: Any):
+        value = copy_containers(value)
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            if len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def clear(self):
+        """Drop the results and reset the metrics."""
+        with self.lock:
+            self.data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def info(self) -> dict:
+        return dict(hits=self.hits, misses=self.misses, size=len(self.data), maxsize=self.maxsize)
+
+    def __len__(self):
+        return len(self.data)
@@ -1,7 +1,32 @@
 from functools import wraps
-from typing import Optional
+from typing import Optional, Union, Callable, Any
 
-from pyverified import Verify
+from pyverified import Verify, ValidationError, msg
+from pyverified.frame._budget import request_options
+from pyverified.frame.cache import ResultCache, rule_keys
+
+# Bytes read at a time from a request body without a Content-Length.
+_CHUNK_SIZE = 64 * 1024
+
+
+def read_body(request, limit: int) -> bytes:
+    """Read the whole body, stopping as soon as it exceeds the size limit.
+
+    The body is kept as the cached data of the request, from which flask
+    parses the JSON and form parameters.
+    """
+    chunks = []
+    size = 0
+    while True:
+        chunk = request.stream.read(_CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > limit:
+            raise ValidationError(msg.message.body_size.format(size=limit))
+        chunks.append(chunk)
+    request._cached_data = b''.join(chunks)
+    return request._cached_data
 
 
 class Params:
@@ -19,7 +44,15 @@ def with_request(
         form: Optional[dict] = None,
         json: Optional[dict] = None,
         headers: Optional[dict] = None,
-        many: bool = False):
+        many: bool = False,
+        max_body_size: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        max_total_nodes: Optional[int] = None,
+        trusted: bool = False,
+        deadline: Union[float, Callable[[Any], Optional[float]], None] = None,
+        max_ops: Optional[int] = None,
+        cache: Union[int, ResultCache, None] = None,
+        lazy: bool = False):
     """Parameter check decorator for flask.
 
     :param query: Validation rules for query string parameters.
@@ -27,7 +60,25 @@ def with_request(
     :param json: Validation rules for JSON parameters.
     :param headers: Request headers check rule.
     :param many: Used in conjunction with the defined JSON validation rules.
+    :param max_body_size: Maximum size of the request body in bytes.
+    :param max_depth: Maximum nesting depth of the JSON parameters.
+    :param max_total_nodes: Maximum number of items in the JSON parameters.
+    :param trusted: Only apply default values and type conversion, skipping every check.
+    :param deadline: Seconds all the checks of a request may take, or a function
+        deriving them from the request, e.g. from its remaining time.
+    :param max_ops: Maximum number of fields verified by each check.
+    :param cache: Maximum number of query and header results kept, or a shared
+        ResultCache. Results are keyed on the raw query string and the values of
+        the checked headers. It is disabled when a rule has a custom function
+        that is not marked with pyverified.frame.cache.pure, and is available as
+        the ``cache`` attribute of the decorated function.
+    :param lazy: Only check the required JSON fields before calling the view,
+        params.json is a LazyParams verifying each field on its first access.
     """
+    result_cache = ResultCache.build(cache, (query, headers)) if (query or headers) else None
+    header_keys = rule_keys(headers) if headers else ()
+    # Results of other decorators sharing the cache are stored under their own token.
+    namespace = object()
 
     def wrapper(func):
         @wraps(func)
@@ -39,30 +90,59 @@ def with_request(
             if not (params and isinstance(params, Params)):
                 params = Params()
 
+            # Share one time budget between all the checks of the request.
+            options = request_options(deadline, trusted, max_ops, request)
+
+            # Reject an oversized body before it is parsed.
+            if max_body_size is not None and (json or form):
+                length = request.content_length
+                if length is None:
+                    read_body(request, max_body_size)
+                elif length > max_body_size:
+                    raise ValidationError(msg.message.body_size.format(size=max_body_size))
+
             # json
             if json:
                 data = request.get_json(silent=True) or {}
-                verified = Verify(data=data, rules=json, many=many)
+                verified = Verify(
+                    data=data, rules=json, many=many,
+                    max_depth=max_depth, max_total_nodes=max_total_nodes, lazy=lazy, **options())
                 params.json = verified.params
 
+            # Query and header results verified before.
+            cached = cache_key = header_data = None
+            if result_cache is not None:
+                header_data = dict(request.headers)
+                cache_key = result_cache.make_key(namespace, request.query_string, header_data, header_keys)
+                cached = result_cache.get(cache_key)
+            if cached is not None:
+                if query:
+                    params.query = cached[0]
+                if headers:
+                    params.headers = cached[1]
+
             # query
-            if query:
-                verified = Verify(data=request.args.to_dict(), rules=query)
+            if query and cached is None:
+                verified = Verify(data=request.args.to_dict(), rules=query, **options())
                 params.query = verified.params
 
             # form
             if form:
-                verified = Verify(data=request.form.to_dict(), rules=form)
+                verified = Verify(data=request.form.to_dict(), rules=form, **options())
                 params.form = verified.params
 
             # header:
-            if headers:
-                verified = Verify(data=dict(request.headers), rules=headers)
+            if headers and cached is None:
+                verified = Verify(data=header_data or dict(request.headers), rules=headers, **options())
                 params.headers = verified.params
 
+            if result_cache is not None and cached is None:
+                result_cache.put(cache_key, [params.query if query else None, params.headers if headers else None])
+
             result = func(*args, **kwargs, params=params)
             return result
 
+        inner.cache = result_cache
         return inner
 
     return wrapper
@@ -33,6 +33,21 @@ class _Message:
     isspace = '{key}的值{value}必须由空白字符组成。'
     istitle = '{key}的值{value}必须是标题化的。'
     regex = '{key}的值{value}不满足正则规则{regex}。'
+    body_size = '请求体大小不能超过{size}字节。'
+    min_items = '{key}的元素个数不能少于{min_items}。'
+    max_items = '{key}的元素个数不能多于{max_items}。'
+    max_depth = '校验数据的嵌套层数不能超过{max_depth}。'
+    max_total_nodes = '校验数据的元素总数不能超过{max_total_nodes}。'
+    ip_allow = '{key}的值{value}不在允许的网段中。'
+    ip_deny = '{key}的值{value}在禁止的网段中。'
+    oneof = '{key}的{discriminator}值{value}不在{choices}中。'
+    timeout = '校验超出了时间或操作次数限制，已校验{records}条记录。'
+    unique = '{key}的元素存在重复，重复元素的下标为{duplicates}。'
+    unique_many = '校验数据存在重复的记录，重复记录的下标为{duplicates}。'
+    email_allow = '{key}的值{value}的域名不在允许的范围中。'
+    email_deny = '{key}的值{value}的域名已被禁止。'
+    exponent = '{key}的值{value}超出了数值范围。'
+    json_float = '{key}的值{value}无法编码为JSON。'
 
     @classmethod
     def reload(cls, clss):
@@ -83,3 +98,18 @@ class _MessageEn:
     isspace = 'The value {value} for {key} must consist of whitespace characters.'
     istitle = 'The value {value} for {key} must be in title case.'
     regex = 'The value {value} of {key} does not satisfy the regular rule {regex}.'
+    body_size = 'The request body must not exceed {size} bytes.'
+    min_items = '{key} must not have fewer than {min_items} items.'
+    max_items = '{key} must not have more than {max_items} items.'
+    max_depth = 'Validation data must not be nested deeper than {max_depth} levels.'
+    max_total_nodes = 'Validation data must not contain more than {max_total_nodes} items in total.'
+    ip_allow = 'The value {value} of {key} is not in the allowed networks.'
+    ip_deny = 'The value {value} of {key} is in the blocked networks.'
+    oneof = 'The {discriminator} value {value} of {key} is not one of {choices}.'
+    timeout = 'Validation exceeded its time or operation budget after {records} records.'
+    unique = '{key} has duplicate items at indexes {duplicates}.'
+    unique_many = 'Validation data has duplicate records at indexes {duplicates}.'
+    email_allow = 'The domain of the value {value} of {key} is not allowed.'
+    email_deny = 'The domain of the value {value} of {key} is blocked.'
+    exponent = 'The value {value} of {key} is out of range.'
+    json_float = 'The value {value} of {key} cannot be encoded as JSON.'
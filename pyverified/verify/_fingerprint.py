@@ -0,0 +1,42 @@
+from typing import Any, Hashable, Iterable, List
+
+from pyverified.verify.record import Record
+
+
+def fingerprint(value: Any) -> Hashable:
+    """Build a hashable key shared only by equal values of the same types.
+
+    The type is part of the key so that ``1``, ``1.0`` and ``True`` are
+    kept apart. A TypeError is raised for values that cannot be hashed.
+    """
+    if isinstance(value, dict):
+        return dict, tuple((k, fingerprint(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(fingerprint(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return type(value), frozenset(fingerprint(v) for v in value)
+    hash(value)
+    return type(value), value
+
+
+def find_duplicates(values: Iterable[Any]) -> List[List[int]]:
+    """Group the indexes of equal values, hashing each value once.
+
+    Only the groups holding more than one index are returned, in the order
+    of their first value.
+    """
+    groups = {}
+    for i, value in enumerate(values):
+        groups.setdefault(fingerprint(value), []).append(i)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def copy_containers(value: Any) -> Any:
+    """Copy the dicts and lists of a verified value, sharing everything else."""
+    if isinstance(value, Record):
+        return type(value)(copy_containers(v) for v in value)
+    if isinstance(value, dict):
+        return {k: copy_containers(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [copy_containers(v) for v in value]
+    return value
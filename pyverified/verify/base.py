@@ -1,6 +1,7 @@
 from typing import Any
 
 from pyverified import msg, ValidationError
+from pyverified.verify._fingerprint import find_duplicates
 from pyverified.verify._unset import Unset, unset
 
 
@@ -9,10 +10,20 @@ class RuleBase:
 
     null_values = (unset, None)
 
+    # Defaults of the options that only some rules define, so that they are
+    # read as plain attributes.
+    batch_func = None
+    unique = False
+
     def parse(self, key: str, value: Any):
         raise NotImplementedError("parse hasn't been implemented yet.")
 
-    def execute_parse(self, key: str, value: Any):
+    def execute_parse(self, key: str, value: Any, batch: bool = True):
+        """Verify the value.
+
+        :param batch: Whether to execute batch_func, False when the caller
+            collects the values of several records to execute it once.
+        """
         if self.multi:  # noqa
             value = self.common_rules_verify(key, value)
 
@@ -21,20 +32,40 @@ class RuleBase:
 
             if not isinstance(value, (list, set, tuple)):
                 raise ValidationError(msg.message.multi.format(key=key, value=value))
-
-            _values = []
-            for _value in value:
-                _value = self.common_rules_verify(key, _value)
-                _value = self.parse(key, _value)
-                _value = self.execute_custom_func(key, _value)
-                _values.append(_value)
-            value = _values
+            self.verify_items(key, value)
+
+            _values = [self.common_rules_verify(key, _value) for _value in value]
+            _values = self.parse_many(key, _values)
+            value = [self.execute_custom_func(key, _value) for _value in _values]
+            if self.unique:
+                self.verify_unique(key, value)
+            if batch and self.batch_func:
+                value = self.execute_batch_func(key, value)
         else:
             value = self.common_rules_verify(key, value)
             value = self.parse(key, value)
             value = self.execute_custom_func(key, value)
+            if batch and self.batch_func:
+                value = self.execute_batch_func(key, [value])[0]
         return value
 
+    def parse_many(self, key: str, values: list) -> list:
+        """Parse all values of a multi field, override it to check them in one batch."""
+        return [self.parse(key, value) for value in values]
+
+    def coerce(self, key: str, value: Any):
+        """Convert the value to the rule type without verifying any constraint."""
+        return value
+
+    def execute_coerce(self, key: str, value: Any):
+        """Apply the default value and the type conversion only."""
+        value = self.set_default_value(value)
+        if isinstance(value, Unset):
+            return None
+        if self.multi and isinstance(value, (list, set, tuple)):  # noqa
+            return [self.coerce(key, _value) for _value in value]
+        return self.coerce(key, value)
+
     def execute_custom_func(self, key, value):
         """Execute custom functions."""
         if self.func:  # noqa
@@ -45,6 +76,31 @@ class RuleBase:
                 value = self.func(key, value)  # noqa
         return value
 
+    def execute_batch_func(self, key: str, values: list) -> list:
+        """Execute the batch function once for many values.
+
+        batch_func(key, values) receives the values that are not None and
+        returns one result per value, in the same order. A ValidationError
+        instance returned as a result marks that value as invalid and is raised.
+        """
+        batch_func = self.batch_func
+        if not batch_func:
+            return values
+
+        indexes = [i for i, value in enumerate(values) if value is not None]
+        if not indexes:
+            return values
+        results = batch_func(key, [values[i] for i in indexes])
+        if len(results) != len(indexes):
+            raise ValueError('batch_func must return one result per value.')
+
+        values = list(values)
+        for i, result in zip(indexes, results):
+            if isinstance(result, ValidationError):
+                raise result
+            values[i] = result
+        return values
+
     def verify_required(self, key: str, value: Any):
         """Check whether parameters are missing."""
         if self.required and isinstance(value, Unset):  # noqa
@@ -74,6 +130,22 @@ class RuleBase:
                 raise ValidationError(msg.message.enum.format(key=key, value=value, enum=tuple(self.enum)))  # noqa
         return value
 
+    def verify_items(self, key: str, value: Any):
+        """Check the number of values before any of them is parsed."""
+        if self.min_items is not None and len(value) < self.min_items:  # noqa
+            raise ValidationError(msg.message.min_items.format(key=key, min_items=self.min_items))  # noqa
+        if self.max_items is not None and len(value) > self.max_items:  # noqa
+            raise ValidationError(msg.message.max_items.format(key=key, max_items=self.max_items))  # noqa
+
+    @staticmethod
+    def verify_unique(key: str, values: list, unique_by=None):
+        """Check that the values, or their unique_by keys, have no duplicates."""
+        if unique_by:
+            values = [tuple(value.get(_key) for _key in unique_by) for value in values]
+        duplicates = find_duplicates(values)
+        if duplicates:
+            raise ValidationError(msg.message.unique.format(key=key, duplicates=duplicates))
+
     def verify_range(self, key: str, value: Any):
         """The range of the check value."""
         if self.gt is not None and value <= self.gt:  # noqa
@@ -0,0 +1,82 @@
+import ipaddress
+from array import array
+from bisect import bisect_right
+from typing import Iterable, List, Union
+
+Network = Union[str, ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+# Bounds of the IPv4-mapped IPv6 addresses, ::ffff:0.0.0.0/96.
+_MAPPED_START = 0xFFFF << 32
+_MAPPED_END = _MAPPED_START + 0xFFFFFFFF
+
+
+class CidrSet:
+    """A set of IPv4 and IPv6 networks for fast address lookup.
+
+    The networks are merged into sorted, non-overlapping integer intervals
+    per IP version, so a lookup is one binary search whatever the number of
+    networks. IPv4 bounds are packed into arrays. An IPv4-mapped IPv6
+    address, ``::ffff:10.0.0.1``, is also looked up as its IPv4 address, so
+    IPv4 networks cannot be bypassed with the mapped form.
+    """
+
+    def __init__(self, networks: Iterable[Network] = ()):
+        intervals = {4: [], 6: []}
+        for network in networks:
+            network = ipaddress.ip_network(network, strict=False)
+            intervals[network.version].append((int(network.network_address), int(network.broadcast_address)))
+
+        self.starts = {}
+        self.ends = {}
+        for version, items in intervals.items():
+            starts, ends = self._merge(items)
+            if version == 4:
+                starts, ends = array('Q', starts), array('Q', ends)
+            self.starts[version] = starts
+            self.ends[version] = ends
+
+    @classmethod
+    def from_file(cls, path: str, encoding: str = 'utf-8') -> 'CidrSet':
+        """Load one network per line, ignoring blank lines and ``#`` comments."""
+        with open(path, encoding=encoding) as fp:
+            return cls(line.split('#', 1)[0].strip() for line in fp if line.split('#', 1)[0].strip())
+
+    @staticmethod
+    def _merge(items):
+        starts, ends = [], []
+        for start, end in sorted(items):
+            if ends and start <= ends[-1] + 1:
+                if end > ends[-1]:
+                    ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+        return starts, ends
+
+    def __len__(self):
+        return len(self.starts[4]) + len(self.starts[6])
+
+    def __contains__(self, address) -> bool:
+        if not isinstance(address, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
+            address = ipaddress.ip_address(address)
+        return self.contains(address.version, int(address))
+
+    def contains(self, version: int, number: int) -> bool:
+        """Whether an integer packed address of the given IP version is in the set."""
+        if version == 6 and _MAPPED_START <= number <= _MAPPED_END and self.contains(4, number - _MAPPED_START):
+            return True
+        i = bisect_right(self.starts[version], number) - 1
+        return i >= 0 and number <= self.ends[version][i]
+
+    def contains_many(self, version: int, numbers: List[int]) -> List[bool]:
+        """Look up many integer packed addresses, one binary search each."""
+        starts, ends = self.starts[version], self.ends[version]
+        mapped = version == 6 and len(self.starts[4]) > 0
+        result = []
+        for number in numbers:
+            if mapped and _MAPPED_START <= number <= _MAPPED_END and self.contains(4, number - _MAPPED_START):
+                result.append(True)
+                continue
+            i = bisect_right(starts, number) - 1
+            result.append(i >= 0 and number <= ends[i])
+        return result
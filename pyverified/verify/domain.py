@@ -0,0 +1,66 @@
+from typing import Iterable, List
+
+
+class DomainSet:
+    """A set of domains for fast lookup of the domain of an email address.
+
+    An entry is either an exact domain, ``example.com``, or a wildcard,
+    ``*.example.com``, matching every subdomain of example.com but not
+    example.com itself. Both kinds are kept in hashed sets, so a lookup
+    costs one set lookup per label of the domain whatever the number of
+    entries. Domains are compared case-insensitively, internationalized
+    ones in their IDNA form.
+    """
+
+    def __init__(self, domains: Iterable[str] = ()):
+        self.exact = set()
+        self.suffixes = set()
+        for domain in domains:
+            domain = self.normalize(domain)
+            if domain.startswith('*.'):
+                self.suffixes.add(domain[2:])
+            elif domain:
+                self.exact.add(domain)
+
+    @classmethod
+    def from_file(cls, path: str, encoding: str = 'utf-8') -> 'DomainSet':
+        """Load one domain per line, ignoring blank lines and ``#`` comments."""
+        with open(path, encoding=encoding) as fp:
+            return cls(line.split('#', 1)[0].strip() for line in fp if line.split('#', 1)[0].strip())
+
+    @staticmethod
+    def normalize(domain: str) -> str:
+        domain = domain.strip().rstrip('.').lower()
+        if not domain.isascii():
+            # Internationalized domains are compared in their IDNA form.
+            domain = domain.encode('idna').decode('ascii')
+        return domain
+
+    def __len__(self):
+        return len(self.exact) + len(self.suffixes)
+
+    def __contains__(self, domain: str) -> bool:
+        return self.contains(self.normalize(domain))
+
+    def contains(self, domain: str) -> bool:
+        """Whether a normalized domain is in the set."""
+        if domain in self.exact:
+            return True
+        if self.suffixes:
+            i = domain.find('.')
+            while i != -1:
+                if domain[i + 1:] in self.suffixes:
+                    return True
+                i = domain.find('.', i + 1)
+        return False
+
+    def match_many(self, domains: List[str]) -> List[bool]:
+        """Look up many normalized domains, each distinct domain once."""
+        found = {}
+        result = []
+        for domain in domains:
+            try:
+                result.append(found[domain])
+            except KeyError:
+                result.append(found.setdefault(domain, self.contains(domain)))
+        return result
@@ -0,0 +1,51 @@
+from collections.abc import Mapping
+from operator import attrgetter
+from typing import Any, Callable, Tuple
+
+from pyverified.verify._unset import unset
+
+# (type, keys) -> extractor, filled the first time a type is seen.
+_extractors = {}
+
+
+def get_extractor(cls: type, keys: Tuple[str, ...]) -> Callable[[Any], tuple]:
+    """Get the function reading ``keys`` from instances of ``cls``.
+
+    The access strategy is chosen once per input type and cached: mappings
+    are read with ``get``, every other object with a single ``attrgetter``
+    call. Once an attribute is found missing, or when a key contains a dot,
+    which attrgetter would follow as a path, the type is read with one
+    ``getattr`` per key instead. Missing keys are returned as ``unset``.
+    """
+    try:
+        return _extractors[(cls, keys)]
+    except KeyError:
+        pass
+
+    def fallback(data):
+        return tuple([getattr(data, key, unset) for key in keys])
+
+    if issubclass(cls, Mapping) or all(hasattr(cls, name) for name in ('get', 'keys', '__getitem__')):
+        def extractor(data):
+            get = data.get
+            return tuple([get(key, unset) for key in keys])
+    elif not keys:
+        def extractor(data):
+            return ()
+    elif any('.' in key for key in keys):
+        extractor = fallback
+    else:
+        getter = attrgetter(*keys)
+        single = len(keys) == 1
+
+        def extractor(data):
+            try:
+                values = getter(data)
+            except AttributeError:
+                # Instances of this type miss attributes, stop trying attrgetter.
+                _extractors[(cls, keys)] = fallback
+                return fallback(data)
+            return (values,) if single else values
+
+    _extractors[(cls, keys)] = extractor
+    return extractor
@@ -0,0 +1,89 @@
+from collections.abc import Mapping
+from typing import Any, Iterator
+
+from pyverified.verify.type_ import OneOf, When
+
+# Marks a field that has not been verified yet.
+_pending = object()
+
+
+class LazyParams(Mapping):
+    """Verified parameters whose fields are verified on first access.
+
+    Missing required fields and the conditions of ``When`` rules are
+    checked when the object is created. The other rules of a field,
+    including its custom functions, only run the first time the field is
+    read, and the result is kept. A ValidationError is raised by the
+    access that reads an invalid field.
+    """
+
+    def __init__(self, verify, data: Any, rules: dict):
+        if isinstance(rules, OneOf):
+            rules = rules.select(rules.discriminator, data)
+
+        self._verify = verify
+        self._rules = {}
+        self._raw = {}
+        self._values = {}
+        items = list(zip(rules.items(), verify.extract(data, rules)))
+        for (key, rule), value in items:
+            if not isinstance(rule, When):
+                rule.verify_required(key, value)
+                self._rules[key] = rule
+                self._raw[key] = value
+                self._values[key] = _pending
+
+        # Conditions are matched against the verified values of the other
+        # keys, the key of a skipped conditional rule counts as None.
+        skipped = set()
+        conditional = False
+        for (key, rule), value in items:
+            if not isinstance(rule, When):
+                continue
+            conditional = True
+            if rule.key in self._values:
+                sibling = self[rule.key]
+            elif rule.key in skipped:
+                sibling = None
+            else:
+                sibling = verify.sibling(data, rule.key)
+            if not rule.match(sibling):
+                skipped.add(key)
+                continue
+            rule.rule.verify_required(key, value)
+            self._rules[key] = rule.rule
+            self._raw[key] = value
+            self._values[key] = _pending
+
+        # Keep the order of the rules.
+        if conditional:
+            self._values = {key: self._values[key] for key in rules if key in self._values}
+
+    def __getitem__(self, key: str):
+        value = self._values[key]
+        if value is _pending:
+            value = self._values[key] = self._verify.verify_field(key, self._rules[key], self._raw[key])
+            del self._raw[key]
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __repr__(self):
+        fields = ', '.join(f'{key}={"..." if value is _pending else repr(value)}' for key, value in self._values.items())
+        return f'LazyParams({fields})'
+
+    @property
+    def verified(self) -> tuple:
+        """Keys of the fields that have been verified."""
+        return tuple(key for key, value in self._values.items() if value is not _pending)
+
+    def to_dict(self) -> dict:
+        """Verify the remaining fields and return all of them as a dict."""
+        return {key: self[key] for key in self._values}
@@ -0,0 +1,135 @@
+from array import array
+from operator import itemgetter
+from typing import Any, Iterable, Tuple, Dict as Dic
+
+# keys -> record type, so that equal schemas share one class.
+_record_types = {}
+
+
+class Record(tuple):
+    """A verified record stored as a tuple.
+
+    Fields can be read as attributes when the key is a valid identifier,
+    or by key with ``record['key']`` for any key.
+    """
+    __slots__ = ()
+
+    _fields: Tuple[str, ...] = ()
+    _index: Dic[str, int] = {}
+
+    def __getitem__(self, item):
+        if isinstance(item, str):
+            try:
+                item = self._index[item]
+            except KeyError:
+                raise KeyError(item) from None
+        return tuple.__getitem__(self, item)
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__, ', '.join(f'{k}={v!r}' for k, v in zip(self._fields, self)))
+
+    def get(self, key: str, default: Any = None):
+        index = self._index.get(key)
+        return default if index is None else tuple.__getitem__(self, index)
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._fields
+
+    def to_dict(self) -> dict:
+        return {key: to_dict(value) for key, value in zip(self._fields, self)}
+
+
+def record_type(keys: Tuple[str, ...]) -> type:
+    """Get the record class holding the given keys."""
+    try:
+        return _record_types[keys]
+    except KeyError:
+        pass
+
+    namespace = {'__slots__': (), '_fields': keys, '_index': {key: i for i, key in enumerate(keys)}}
+    for i, key in enumerate(keys):
+        if key.isidentifier() and not key.startswith('_') and not hasattr(Record, key):
+            namespace[key] = property(itemgetter(i))
+    cls = _record_types[keys] = type('Record', (Record,), namespace)
+    return cls
+
+
+class RecordBatch:
+    """Column oriented container of the records of a ``many=True`` result.
+
+    Each field is stored as one column instead of one object per record.
+    Columns that only hold ints or floats are packed into ``array.array``.
+    Indexing returns a ``Record`` built on access.
+    """
+
+    def __init__(self, keys: Tuple[str, ...]):
+        self.keys = keys
+        self.type = record_type(keys)
+        self.columns = [[] for _ in keys]
+        self.size = 0
+
+    @classmethod
+    def from_records(cls, keys: Tuple[str, ...], records: Iterable[tuple]) -> 'RecordBatch':
+        batch = cls(keys)
+        for record in records:
+            batch.append(record)
+        batch.compact()
+        return batch
+
+    def append(self, record: tuple):
+        for column, value in zip(self.columns, record):
+            column.append(value)
+        self.size += 1
+
+    def compact(self):
+        """Pack the columns of plain ints or floats into arrays."""
+        for i, column in enumerate(self.columns):
+            if not isinstance(column, list) or not column:
+                continue
+            kind = type(column[0])
+            if kind is int:
+                typecode = 'q'
+            elif kind is float:
+                typecode = 'd'
+            else:
+                continue
+            if all(type(value) is kind for value in column):
+                try:
+                    self.columns[i] = array(typecode, column)
+                except OverflowError:
+                    pass
+
+    def column(self, key: str):
+        return self.columns[self.type._index[key]]
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(self.size))]
+        if item < 0:
+            item += self.size
+        if not 0 <= item < self.size:
+            raise IndexError('record index out of range')
+        return self.type(column[item] for column in self.columns)
+
+    def __iter__(self):
+        record = self.type
+        for values in zip(*self.columns):
+            yield record(values)
+
+    def __repr__(self):
+        return f'RecordBatch(keys={self.keys!r}, size={self.size})'
+
+    def to_dict(self) -> list:
+        return [record.to_dict() for record in self]
+
+
+def to_dict(value: Any) -> Any:
+    """Convert records, batches and lists of them back to plain dicts."""
+    if isinstance(value, (Record, RecordBatch)):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [to_dict(v) for v in value]
+    return value
@@ -0,0 +1,79 @@
+import random
+from typing import Any, Optional
+
+
+class Sampler:
+    """Choose which records of a trusted stream are fully verified.
+
+    The records that are not chosen only get their default values and type
+    conversion. Statistics are kept across every ``Verify`` call the sampler
+    is passed to, and once the violation rate of the verified records reaches
+    ``threshold`` every following record is fully verified until ``reset``.
+
+    :param rate: Fraction of the records to verify, between 0 and 1.
+    :param every: Verify one record out of every ``every`` instead of sampling randomly.
+    :param seed: Seed of the random generator, for a reproducible sample.
+    :param threshold: Violation rate that switches to full verification.
+    :param min_samples: Number of verified records needed before the threshold applies.
+    :param on_violation: What to do with a record of a many=True batch that
+        fails its verification: 'raise' stops the batch, 'drop' leaves the
+        record out of the result and 'collect' also keeps it with its error
+        in ``rejected``.
+    """
+
+    def __init__(
+            self,
+            rate: float = 0.01,
+            *,
+            every: Optional[int] = None,
+            seed: Optional[int] = None,
+            threshold: float = 0.01,
+            min_samples: int = 100,
+            on_violation: str = 'raise'):
+        if not 0 <= rate <= 1:
+            raise ValueError('rate must be between 0 and 1.')
+        if every is not None and every < 1:
+            raise ValueError('every must be a positive integer.')
+        if on_violation not in ('raise', 'drop', 'collect'):
+            raise ValueError("on_violation must be 'raise', 'drop' or 'collect'.")
+        self.rate = rate
+        self.every = every
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.on_violation = on_violation
+        self.rejected = []
+        self.random = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        """Clear the statistics and go back to sampling."""
+        self.seen = 0
+        self.checked = 0
+        self.violations = 0
+        self.escalated = False
+
+    @property
+    def violation_rate(self) -> float:
+        return self.violations / self.checked if self.checked else 0.0
+
+    def should_verify(self) -> bool:
+        """Whether the next record has to be fully verified."""
+        self.seen += 1
+        if self.escalated:
+            return True
+        if self.every is not None:
+            return (self.seen - 1) % self.every == 0
+        return self.random.random() < self.rate
+
+    def record(self, valid: bool):
+        """Count the result of a verified record."""
+        self.checked += 1
+        if not valid:
+            self.violations += 1
+        if self.checked >= self.min_samples and self.violation_rate >= self.threshold:
+            self.escalated = True
+
+    def reject(self, data: Any, error: Exception):
+        """Keep a record left out of the result, when collecting them."""
+        if self.on_violation == 'collect':
+            self.rejected.append((data, error))
@@ -0,0 +1,84 @@
+import json
+import math
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Iterable, Iterator
+
+from pyverified import ValidationError, msg
+
+
+def default(value: Any) -> Any:
+    """Convert the values produced by the rules that JSON has no type for.
+
+    datetime and date are written in the default formats of the DateTime
+    and Date rules, Decimal as a string to keep its exact digits.
+    """
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    to_dict = getattr(value, 'to_dict', None)
+    if to_dict is not None:
+        return to_dict()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+# NaN and infinite floats have no JSON form, they are rejected instead of
+# being written as the NaN and Infinity tokens other parsers refuse.
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=default, allow_nan=False)
+
+
+def check_finite(value: Any, key: str = 'value'):
+    """Raise a ValidationError for the first NaN or infinite float of a value."""
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValidationError(msg.message.json_float.format(key=key, value=value))
+    elif isinstance(value, dict):
+        for _key, _value in value.items():
+            check_finite(_value, _key)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for _value in value:
+            check_finite(_value, key)
+
+
+def dumps(value: Any) -> bytes:
+    """Encode a verified value as compact UTF-8 JSON."""
+    try:
+        return _encoder.encode(value).encode('utf-8')
+    except ValueError:
+        check_finite(value)
+        raise
+
+
+def dumps_lines(values: Iterable[Any]) -> bytes:
+    """Encode verified records as NDJSON, one record per line.
+
+    Each record is encoded as soon as it is produced, so the records of a
+    generator are released one by one instead of being kept in a list.
+    """
+    encode = _encoder.encode
+    lines = []
+    for value in values:
+        try:
+            lines.append(encode(value) + '\n')
+        except ValueError:
+            check_finite(value)
+            raise
+    return ''.join(lines).encode('utf-8')
+
+
+def iter_ndjson(data: Iterable[Any], rules: dict, **options) -> Iterator[bytes]:
+    """Verify a stream of records one at a time and yield them as NDJSON lines.
+
+    :param data: Any iterable of records, e.g. a file or a database cursor.
+    :param rules: Rules of one record.
+    :param options: Other options of Verify, applied to each record.
+    """
+    from pyverified.verify.verify import Verify
+
+    for record in data:
+        yield Verify(record, rules, output='json', **options).params + b'\n'
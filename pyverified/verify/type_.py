@@ -2,8 +2,7 @@ import ipaddress
 import re
 from dataclasses import dataclass
 from datetime import date, datetime, time
-from decimal import Decimal
-from email.utils import parseaddr
+from decimal import Context, Decimal, MAX_PREC
 from typing import List as typingList, Dict as typingDict
 from typing import Union, Any, Callable
 from urllib.parse import urlparse
@@ -11,6 +10,8 @@ from urllib.parse import urlparse
 from pyverified import ValidationError, msg
 from pyverified.verify._unset import Unset, unset
 from pyverified.verify.base import RuleBase
+from pyverified.verify.cidr import CidrSet
+from pyverified.verify.domain import DomainSet
 
 
 @dataclass
@@ -29,6 +30,18 @@ class Bool(RuleBase):
     # convert: Whether to convert true, false The string is of Boolean type.
     convert: bool = True
 
+    # min_items/max_items: Limits the number of values when multi is True.
+    min_items: Union[int, None] = None
+    max_items: Union[int, None] = None
+
+    # unique: Rejects duplicate values when multi is True.
+    unique: bool = False
+
+    # batch_func: user-defined function called once with all the values of the
+    # field, of a multi list or of every record of a many=True batch, see
+    # RuleBase.execute_batch_func.
+    batch_func: Union[Callable, None] = None
+
     def parse(self, key: str, value: Any):
         if (isinstance(value, str) and value.strip() == '') or value in self.null_values:
             return value
@@ -44,6 +57,15 @@ class Bool(RuleBase):
             raise ValidationError(msg.message.type.format(key=key, value=value, type=self.get_type_name(bool)))
         return value
 
+    def coerce(self, key: str, value: Any):
+        if self.convert and isinstance(value, str):
+            upper_value = value.upper()
+            if upper_value == 'TRUE':
+                value = True
+            elif upper_value == "FALSE":
+                value = False
+        return value
+
 
 @dataclass
 class Int(RuleBase):
@@ -67,6 +89,18 @@ class Int(RuleBase):
     # enum: enumeration.
     enum: Union[typingDict[int, Any], typingList[Union[int, float]], None] = None
 
+    # min_items/max_items: Limits the number of values when multi is True.
+    min_items: Union[int, None] = None
+    max_items: Union[int, None] = None
+
+    # unique: Rejects duplicate values when multi is True.
+    unique: bool = False
+
+    # batch_func: user-defined function called once with all the values of the
+    # field, of a multi list or of every record of a many=True batch, see
+    # RuleBase.execute_batch_func.
+    batch_func: Union[Callable, None] = None
+
     def parse(self, key: str, value: Any):
         if (isinstance(value, str) and value.strip() == '') or value in self.null_values:
             return value
@@ -84,6 +118,19 @@ class Int(RuleBase):
 
         return value
 
+    def coerce(self, key: str, value: Any):
+        if (isinstance(value, str) and value.strip() == '') or value in self.null_values:
+            return value
+
+        try:
+            value = int(value)
+        except ValueError:
+            raise ValidationError(msg.message.type.format(key=key, value=value, type=self.get_type_name(int)))
+
+        if isinstance(self.enum, dict):
+            value = self.enum.get(value, value)
+        return value
+
 
 @dataclass
 class Float(RuleBase):
@@ -107,13 +154,47 @@ class Float(RuleBase):
     # digits: Reserved decimal places
     digits: Union[int, None] = None
 
-    # decimal: Whether to convert to decimal data type
+    # decimal: Whether to convert to decimal data type. The value is parsed
+    # directly into a Decimal, without going through a binary float.
     decimal: bool = False
 
+    # max_exponent: Largest decimal exponent accepted in decimal mode, the
+    # default is the float range. None removes the limit.
+    max_exponent: Union[int, None] = 308
+
+    # min_items/max_items: Limits the number of values when multi is True.
+    min_items: Union[int, None] = None
+    max_items: Union[int, None] = None
+
+    # unique: Rejects duplicate values when multi is True.
+    unique: bool = False
+
+    # batch_func: user-defined function called once with all the values of the
+    # field, of a multi list or of every record of a many=True batch, see
+    # RuleBase.execute_batch_func.
+    batch_func: Union[Callable, None] = None
+
+    # Context of the decimal rounding, half to even like round().
+    context = Context(prec=MAX_PREC)
+
+    def __post_init__(self):
+        # Precompute the decimal places and bounds once instead of on every value.
+        if self.decimal:
+            self.quantum = None if self.digits is None else Decimal(1).scaleb(-self.digits)
+            for name in ('gt', 'gte', 'lt', 'lte'):
+                bound = getattr(self, name)
+                if bound is not None:
+                    setattr(self, name, self.to_decimal(bound))
+
     def parse(self, key: str, value: Any):
         if (isinstance(value, str) and value.strip() == '') or value in self.null_values:
             return value
 
+        if self.decimal:
+            value = self.convert_decimal(key, value)
+            self.verify_range(key, value)
+            return self.quantize(key, value)
+
         try:
             value = float(value)
         except ValueError:
@@ -122,15 +203,85 @@ class Float(RuleBase):
         # range
         self.verify_range(key, value)
 
+        return self.round(value)
+
+    def parse_many(self, key: str, values: list) -> list:
+        if not self.decimal:
+            return super().parse_many(key, values)
+
+        # Convert the whole column, then check the bounds against its
+        # smallest and largest values and quantize it in one pass.
+        values = list(values)
+        indexes, numbers = [], []
+        for index, value in enumerate(values):
+            if not ((isinstance(value, str) and value.strip() == '') or value in self.null_values):
+                indexes.append(index)
+                numbers.append(self.convert_decimal(key, value))
+        if not numbers:
+            return values
+
+        self.verify_range(key, min(numbers))
+        self.verify_range(key, max(numbers))
+        if self.quantum is not None:
+            quantum, context = self.quantum, self.context
+            try:
+                numbers = [number.quantize(quantum, context=context) for number in numbers]
+            except ArithmeticError:
+                numbers = [self.quantize(key, number) for number in numbers]
+        for index, number in zip(indexes, numbers):
+            values[index] = number
+        return values
+
+    def coerce(self, key: str, value: Any):
+        if (isinstance(value, str) and value.strip() == '') or value in self.null_values:
+            return value
+
+        if self.decimal:
+            value = self.convert_decimal(key, value)
+            return self.quantize(key, value)
+
+        try:
+            value = float(value)
+        except ValueError:
+            raise ValidationError(msg.message.type.format(key=key, value=value, type=self.get_type_name(float)))
+
+        return self.round(value)
+
+    def round(self, value: float):
         # Reserve the specified number of decimal places.
         if self.digits is not None:
             value = round(value, self.digits)
+        return value
 
-        # Convert to decimal.
-        if self.decimal:
-            value = Decimal(value)
+    def convert_decimal(self, key: str, value: Any) -> Decimal:
+        """Convert the value to a finite Decimal."""
+        try:
+            number = self.to_decimal(value)
+        except (ArithmeticError, ValueError, TypeError):
+            number = None
+        if number is None or not number.is_finite():
+            raise ValidationError(msg.message.type.format(key=key, value=value, type=self.get_type_name(Decimal)))
+        if self.max_exponent is not None and number and abs(number.adjusted()) > self.max_exponent:
+            raise ValidationError(msg.message.exponent.format(key=key, value=value))
+        return number
+
+    def quantize(self, key: str, value: Decimal) -> Decimal:
+        """Keep the decimal places set by digits."""
+        if self.quantum is None:
+            return value
+        try:
+            return value.quantize(self.quantum, context=self.context)
+        except ArithmeticError:
+            raise ValidationError(msg.message.exponent.format(key=key, value=value))
 
-        return value
+    @staticmethod
+    def to_decimal(value: Any) -> Decimal:
+        """Convert exactly, floats are converted from their shortest repr."""
+        if isinstance(value, Decimal):
+            return value
+        if isinstance(value, float):
+            return Decimal(repr(value))
+        return Decimal(value)
 
 
 @dataclass
@@ -234,6 +385,18 @@ class Str(RuleBase):
     # re
     regex: Union[str, None] = None
 
+    # min_items/max_items: Limits the number of values when multi is True.
+    min_items: Union[int, None] = None
+    max_items: Union[int, None] = None
+
+    # unique: Rejects duplicate values when multi is True.
+    unique: bool = False
+
+    # batch_func: user-defined function called once with all the values of the
+    # field, of a multi list or of every record of a many=True batch, see
+    # RuleBase.execute_batch_func.
+    batch_func: Union[Callable, None] = None
+
     def parse(self, key: str, value: Any):
         if value not in self.null_values:
             # All types can be converted by str, so there is
@@ -248,28 +411,7 @@ class Str(RuleBase):
                 raise ValidationError(msg.message.maxLength.format(key=key, value=value, maxLength=self.maxLength))
 
             # rewriting
-            if self.replace:
-                value = value.replace(*self.replace_args)
-            if self.capitalize:
-                value = value.capitalize()
-            if self.title:
-                value = value.title()
-            if self.swapcase:
-                value = value.swapcase()
-            if self.lower:
-                value = value.lower()
-            if self.upper:
-                value = value.upper()
-            if self.casefold:
-                value = value.casefold()
-
-            # Remove Spaces at the beginning and end of the string.
-            if self.strip:
-                value = value.strip(self.strip_chars) if self.strip_chars is not None else value.strip()
-            if self.lstrip:
-                value = value.lstrip(self.lstrip_chars) if self.lstrip_chars is not None else value.lstrip()
-            if self.rstrip:
-                value = value.rstrip(self.rstrip_chars) if self.rstrip_chars is not None else value.rstrip()
+            value = self.rewrite(value)
 
             # String rule judgment.
             if self.startswith is not None and not value.startswith(self.startswith):
@@ -303,17 +445,7 @@ class Str(RuleBase):
 
             # split
             if self.split is not None:
-                value = value.split(self.split)
-                if self.split2type is not None:
-                    _value = []
-                    for _v in value:
-                        try:
-                            _v = self.split2type(_v)
-                        except ValueError:
-                            raise ValidationError(msg.message.type.format(
-                                key=key, value=_v, type=self.get_type_name(self.split2type)))
-                        _value.append(_v)
-                    value = _value
+                value = self.split_value(key, value)
 
             # re
             if self.regex is not None:
@@ -335,6 +467,59 @@ class Str(RuleBase):
 
         return value
 
+    def coerce(self, key: str, value: Any):
+        if value not in self.null_values:
+            value = self.rewrite(str(value))
+            if self.split is not None:
+                value = self.split_value(key, value)
+            if isinstance(self.enum, dict):
+                if isinstance(value, list):
+                    value = [self.enum.get(_v, _v) for _v in value]
+                else:
+                    value = self.enum.get(value, value)
+        return value
+
+    def rewrite(self, value: str) -> str:
+        """Rewrite the string and remove the specified characters at both ends."""
+        if self.replace:
+            value = value.replace(*self.replace_args)
+        if self.capitalize:
+            value = value.capitalize()
+        if self.title:
+            value = value.title()
+        if self.swapcase:
+            value = value.swapcase()
+        if self.lower:
+            value = value.lower()
+        if self.upper:
+            value = value.upper()
+        if self.casefold:
+            value = value.casefold()
+
+        # Remove Spaces at the beginning and end of the string.
+        if self.strip:
+            value = value.strip(self.strip_chars) if self.strip_chars is not None else value.strip()
+        if self.lstrip:
+            value = value.lstrip(self.lstrip_chars) if self.lstrip_chars is not None else value.lstrip()
+        if self.rstrip:
+            value = value.rstrip(self.rstrip_chars) if self.rstrip_chars is not None else value.rstrip()
+        return value
+
+    def split_value(self, key: str, value: str) -> list:
+        """Cut the string and convert each part to split2type."""
+        value = value.split(self.split)
+        if self.split2type is not None:
+            _value = []
+            for _v in value:
+                try:
+                    _v = self.split2type(_v)
+                except ValueError:
+                    raise ValidationError(msg.message.type.format(
+                        key=key, value=_v, type=self.get_type_name(self.split2type)))
+                _value.append(_v)
+            value = _value
+        return value
+
     def verify_regex(self, key, value):
         if not bool(re.match(self.regex, value)):
             raise ValidationError(msg.message.regex.format(key=key, value=value, regex=self.regex))
@@ -365,6 +550,18 @@ class DateTime(RuleBase):
     # enum: Date enumeration.
     enum: Union[typingList[str], typingList[datetime], typingList[date], None] = None
 
+    # min_items/max_items: Limits the number of values when multi is True.
+    min_items: Union[int, None] = None
+    max_items: Union[int, None] = None
+
+    # unique: Rejects duplicate values when multi is True.
+    unique: bool = False
+
+    # batch_func: user-defined function called once with all the values of the
+    # field, of a multi list or of every record of a many=True batch, see
+    # RuleBase.execute_batch_func.
+    batch_func: Union[Callable, None] = None
+
     def parse(self, key: str, value: Any):
         if (isinstance(value, str) and value.strip() == '') or value in self.null_values:
             return value
@@ -393,10 +590,30 @@ class DateTime(RuleBase):
 
         return value
 
-    def execute_parse(self, key: str, value: Any):
+    def execute_parse(self, key: str, value: Any, batch: bool = True):
         # Convert the data type before verifying the rule.
         self.trans_rule_value_type()
-        return super().execute_parse(key, value)
+        return super().execute_parse(key, value, batch)
+
+    def coerce(self, key: str, value: Any):
+        if (isinstance(value, str) and value.strip() == '') or value in self.null_values:
+            return value
+
+        try:
+            value = self._try_trans_data(value)
+        except ValueError:
+            raise ValidationError(msg.message.type.format(
+                key=key, value=value, type=self.get_type_name(self._get_type())))
+
+        if type(value) is not self._get_type():
+            value = value.date()
+
+        return value
+
+    def execute_coerce(self, key: str, value: Any):
+        # Convert the default value like execute_parse does.
+        self.trans_rule_value_type()
+        return super().execute_coerce(key, value)
 
     @staticmethod
     def _get_type():
@@ -496,6 +713,63 @@ class List(RuleBase):
     # dest: indicates that all information about a subordinate structure is obtained without verification.
     dest: bool = False
 
+    # min_items/max_items: Limits the number of items in the list.
+    min_items: Union[int, None] = None
+    max_items: Union[int, None] = None
+
+    # unique: Rejects duplicate items.
+    # unique_by: Rejects items with the same values of these keys.
+    unique: bool = False
+    unique_by: Union[typingList[str], tuple, None] = None
+
+
+@dataclass
+class OneOf(RuleBase):
+    # required: Whether it is required.
+    # allow_none: indicates whether None is allowed.
+    # multi: When True, the validation data is a list of dictionaries.
+    # discriminator: key of the dictionary whose value selects the rule structure.
+    # choices: maps each discriminator value to its rule structure.
+    discriminator: str
+    choices: dict
+    default: Union[dict, Unset] = unset
+    required: bool = False
+    allow_none: bool = True
+    multi: bool = False
+
+    # min_items/max_items: Limits the number of values when multi is True.
+    min_items: Union[int, None] = None
+    max_items: Union[int, None] = None
+
+    def select(self, key: str, value: Any) -> dict:
+        """Get the rule structure of the value with one dict lookup."""
+        if isinstance(value, dict):
+            tag = value.get(self.discriminator)
+        else:
+            tag = getattr(value, self.discriminator, None)
+        try:
+            return self.choices[tag]
+        except (KeyError, TypeError):
+            raise ValidationError(msg.message.oneof.format(
+                key=key, value=tag, discriminator=self.discriminator, choices=tuple(self.choices)))
+
+
+@dataclass
+class When(RuleBase):
+    # key: another key of the same dictionary, the rule is only evaluated
+    # when its value equals value or is in values. Otherwise the field is
+    # left out of the result.
+    # rule: the rule that is applied.
+    key: str
+    rule: RuleBase
+    value: Any = unset
+    values: Union[list, tuple, set, frozenset, None] = None
+
+    def match(self, sibling: Any) -> bool:
+        if self.values is not None:
+            return sibling in self.values
+        return sibling == self.value
+
 
 @dataclass
 class Email(RuleBase):
@@ -510,19 +784,144 @@ class Email(RuleBase):
     multi: bool = False
     func: Union[Callable, typingList[Callable], None] = None
 
+    # min_items/max_items: Limits the number of values when multi is True.
+    min_items: Union[int, None] = None
+    max_items: Union[int, None] = None
+
+    # unique: Rejects duplicate values when multi is True.
+    unique: bool = False
+
+    # batch_func: user-defined function called once with all the values of the
+    # field, of a multi list or of every record of a many=True batch, see
+    # RuleBase.execute_batch_func.
+    batch_func: Union[Callable, None] = None
+
+    # allow: Domains the address must belong to.
+    # deny: Domains the address must not belong to.
+    # Both accept a list of domains, "*.example.com" matching every subdomain
+    # of example.com, or a DomainSet, e.g. DomainSet.from_file(path).
+    allow: Union[DomainSet, typingList[str], None] = None
+    deny: Union[DomainSet, typingList[str], None] = None
+
+    # Dot-atom local part of RFC 5321 extended to UTF-8 by RFC 6531, and host
+    # name labels checked on the IDNA form of the domain. Quoted local parts,
+    # comments and address literals are not accepted.
+    local_pattern = re.compile(
+        r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~\u0080-\U0010ffff-]+(?:\.[A-Za-z0-9!#$%&'*+/=?^_`{|}~\u0080-\U0010ffff-]+)*")
+    domain_pattern = re.compile(
+        r"(?:[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?\.)+[A-Za-z](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?")
+
+    def __post_init__(self):
+        # Index the domains once instead of on every check.
+        if self.allow is not None and not isinstance(self.allow, DomainSet):
+            self.allow = DomainSet(self.allow)
+        if self.deny is not None and not isinstance(self.deny, DomainSet):
+            self.deny = DomainSet(self.deny)
+
     def parse(self, key: str, value: Any) -> str:
-        if value not in self.null_values and not self.is_email(value):
+        if value not in self.null_values:
+            domain = self.get_domain(key, value)
+            if self.allow is not None and not self.allow.contains(domain):
+                raise ValidationError(msg.message.email_allow.format(key=key, value=value))
+            if self.deny is not None and self.deny.contains(domain):
+                raise ValidationError(msg.message.email_deny.format(key=key, value=value))
+        return value
+
+    def parse_many(self, key: str, values: list) -> list:
+        indexes, domains = [], []
+        for index, value in enumerate(values):
+            if value not in self.null_values:
+                indexes.append(index)
+                domains.append(self.get_domain(key, value))
+        if self.allow is not None:
+            for index, found in zip(indexes, self.allow.match_many(domains)):
+                if not found:
+                    raise ValidationError(msg.message.email_allow.format(key=key, value=values[index]))
+        if self.deny is not None:
+            for index, found in zip(indexes, self.deny.match_many(domains)):
+                if found:
+                    raise ValidationError(msg.message.email_deny.format(key=key, value=values[index]))
+        return values
+
+    def get_domain(self, key: str, value: Any) -> str:
+        """Check the address syntax and return its lower case ASCII domain."""
+        domain = self.split_domain(str(value))
+        if domain is None:
             raise ValidationError(msg.message.email.format(key=key, value=value))
+        return domain
+
+    @classmethod
+    def split_domain(cls, value: str) -> Union[str, None]:
+        """The lower case domain of a valid address in its IDNA form, None otherwise."""
+        # Bound the length before running the patterns.
+        if len(value) > 254:
+            return None
+        local, _, domain = value.rpartition('@')
+        if not local or len(local) > 64 or cls.local_pattern.fullmatch(local) is None:
+            return None
+        if not domain.isascii():
+            try:
+                domain = domain.encode('idna').decode('ascii')
+            except UnicodeError:
+                return None
+        if cls.domain_pattern.fullmatch(domain) is None:
+            return None
+        return domain.lower()
+
+    @classmethod
+    def is_email(cls, e_mail: Any) -> bool:
+        return cls.split_domain(str(e_mail)) is not None
+
+
+class IPAddress(RuleBase):
+    """Address syntax and network membership checks shared by IPv4 and IPv6."""
+
+    version: int
+    address_type: type
+
+    def __post_init__(self):
+        # Index the networks once instead of on every check.
+        if self.allow is not None and not isinstance(self.allow, CidrSet):  # noqa
+            self.allow = CidrSet(self.allow)
+        if self.deny is not None and not isinstance(self.deny, CidrSet):  # noqa
+            self.deny = CidrSet(self.deny)
+
+    def parse(self, key: str, value: Any) -> str:
+        if value not in self.null_values:
+            number = self.to_int(key, value)
+            if self.allow is not None and not self.allow.contains(self.version, number):  # noqa
+                raise ValidationError(msg.message.ip_allow.format(key=key, value=value))
+            if self.deny is not None and self.deny.contains(self.version, number):  # noqa
+                raise ValidationError(msg.message.ip_deny.format(key=key, value=value))
         return value
 
-    @staticmethod
-    def is_email(e_mail: Any):
-        _, email_address = parseaddr(str(e_mail))
-        return '@' in email_address
+    def parse_many(self, key: str, values: list) -> list:
+        indexes, numbers = [], []
+        for index, value in enumerate(values):
+            if value not in self.null_values:
+                indexes.append(index)
+                numbers.append(self.to_int(key, value))
+        if self.allow is not None:  # noqa
+            for index, found in zip(indexes, self.allow.contains_many(self.version, numbers)):  # noqa
+                if not found:
+                    raise ValidationError(msg.message.ip_allow.format(key=key, value=values[index]))
+        if self.deny is not None:  # noqa
+            for index, found in zip(indexes, self.deny.contains_many(self.version, numbers)):  # noqa
+                if found:
+                    raise ValidationError(msg.message.ip_deny.format(key=key, value=values[index]))
+        return values
+
+    def to_int(self, key: str, value: Any) -> int:
+        """Parse the address into its integer form."""
+        try:
+            return int(self.address_type(str(value)))
+        except ipaddress.AddressValueError:
+            message = msg.message.ipv4 if self.version == 4 else msg.message.ipv6
+            raise ValidationError(message.format(key=key, value=value))
 
 
 @dataclass
-class IPv4(RuleBase):
+class IPv4(IPAddress):
     # default: indicates the default value.
     # required: Whether it is required.
     # allow_none: indicates whether None is allowed.
@@ -534,10 +933,26 @@ class IPv4(RuleBase):
     multi: bool = False
     func: Union[Callable, typingList[Callable], None] = None
 
-    def parse(self, key: str, value: Any) -> str:
-        if value not in self.null_values and not self.allow_none and not self.is_ipv4(value):
-            raise ValidationError(msg.message.ipv4.format(key=key, value=value))
-        return value
+    # min_items/max_items: Limits the number of values when multi is True.
+    min_items: Union[int, None] = None
+    max_items: Union[int, None] = None
+
+    # unique: Rejects duplicate values when multi is True.
+    unique: bool = False
+
+    # batch_func: user-defined function called once with all the values of the
+    # field, of a multi list or of every record of a many=True batch, see
+    # RuleBase.execute_batch_func.
+    batch_func: Union[Callable, None] = None
+
+    # allow: Networks the address must belong to.
+    # deny: Networks the address must not belong to.
+    # Both accept a list of CIDR strings or a CidrSet, e.g. CidrSet.from_file(path).
+    allow: Union[CidrSet, typingList[str], None] = None
+    deny: Union[CidrSet, typingList[str], None] = None
+
+    version = 4
+    address_type = ipaddress.IPv4Address
 
     @staticmethod
     def is_ipv4(address: Any) -> bool:
@@ -549,7 +964,7 @@ class IPv4(RuleBase):
 
 
 @dataclass
-class IPv6(RuleBase):
+class IPv6(IPAddress):
     # default: indicates the default value.
     # required: Whether it is required.
     # allow_none: indicates whether None is allowed.
@@ -561,10 +976,26 @@ class IPv6(RuleBase):
     multi: bool = False
     func: Union[Callable, typingList[Callable], None] = None
 
-    def parse(self, key: str, value: Any) -> str:
-        if value not in self.null_values and not self.is_ipv6(value):
-            raise ValidationError(msg.message.ipv6.format(key=key, value=value))
-        return value
+    # min_items/max_items: Limits the number of values when multi is True.
+    min_items: Union[int, None] = None
+    max_items: Union[int, None] = None
+
+    # unique: Rejects duplicate values when multi is True.
+    unique: bool = False
+
+    # batch_func: user-defined function called once with all the values of the
+    # field, of a multi list or of every record of a many=True batch, see
+    # RuleBase.execute_batch_func.
+    batch_func: Union[Callable, None] = None
+
+    # allow: Networks the address must belong to.
+    # deny: Networks the address must not belong to.
+    # Both accept a list of CIDR strings or a CidrSet, e.g. CidrSet.from_file(path).
+    allow: Union[CidrSet, typingList[str], None] = None
+    deny: Union[CidrSet, typingList[str], None] = None
+
+    version = 6
+    address_type = ipaddress.IPv6Address
 
     @staticmethod
     def is_ipv6(address: Any) -> bool:
@@ -589,6 +1020,18 @@ class Phone(RuleBase):
     func: Union[Callable, typingList[Callable], None] = None
     region: str = 'CN'
 
+    # min_items/max_items: Limits the number of values when multi is True.
+    min_items: Union[int, None] = None
+    max_items: Union[int, None] = None
+
+    # unique: Rejects duplicate values when multi is True.
+    unique: bool = False
+
+    # batch_func: user-defined function called once with all the values of the
+    # field, of a multi list or of every record of a many=True batch, see
+    # RuleBase.execute_batch_func.
+    batch_func: Union[Callable, None] = None
+
     def parse(self, key: str, value: Any) -> str:
         if value not in self.null_values and not self.is_tel(value):
             raise ValidationError(msg.message.phone.format(key=key, value=value, region=self.region))
@@ -619,6 +1062,18 @@ class Addr(RuleBase):
     multi: bool = False
     func: Union[Callable, typingList[Callable], None] = None
 
+    # min_items/max_items: Limits the number of values when multi is True.
+    min_items: Union[int, None] = None
+    max_items: Union[int, None] = None
+
+    # unique: Rejects duplicate values when multi is True.
+    unique: bool = False
+
+    # batch_func: user-defined function called once with all the values of the
+    # field, of a multi list or of every record of a many=True batch, see
+    # RuleBase.execute_batch_func.
+    batch_func: Union[Callable, None] = None
+
     def parse(self, key: str, value: Any) -> str:
         if value not in self.null_values and not self.is_addr(value):
             raise ValidationError(msg.message.address.format(key=key, value=value))
@@ -1,65 +1,638 @@
-from typing import Union, Dict as Dic
+import time
+from typing import Union, Optional, Tuple, Callable, Any, Dict as Dic
 
 from pyverified import ValidationError, msg
-from pyverified.verify._unset import unset
+from pyverified.exc import ValidationTimeout
+from pyverified.verify._fingerprint import fingerprint, copy_containers, find_duplicates
+from pyverified.verify._unset import Unset, unset
 from pyverified.verify.base import RuleBase
-from pyverified.verify.type_ import List, Dict
+from pyverified.verify.extract import get_extractor
+from pyverified.verify.lazy import LazyParams
+from pyverified.verify.record import record_type, RecordBatch
+from pyverified.verify.sample import Sampler
+from pyverified.verify.serialize import dumps, dumps_lines
+from pyverified.verify.type_ import List, Dict, OneOf, When
+
+
+# How a rule is coerced, see Verify.get_plan.
+_VALUE, _LIST, _DICT, _RAW, _ONEOF, _WHEN = range(6)
+
+# Marks a key that was missing before an inplace write.
+_missing = object()
+
+# Marks the value of a conditional rule that was not selected.
+_skipped = object()
+
+# Marks a value that has not been verified yet.
+_pending = object()
+
+# Marks a record left out of a many=True result by the sampler.
+_rejected = object()
 
 
 class Verify:
 
-    def __init__(self, data: Union[dict, list, set, tuple], rules: Dic[str, RuleBase], *, many: bool = False):
+    def __init__(
+            self,
+            data: Union[dict, list, set, tuple],
+            rules: Dic[str, RuleBase],
+            *,
+            many: bool = False,
+            max_depth: Optional[int] = None,
+            max_total_nodes: Optional[int] = None,
+            sample: Optional[Sampler] = None,
+            dedup: Union[bool, str] = False,
+            dedup_fields: Tuple[str, ...] = (),
+            prefetch: Optional[Callable[[list, Tuple[str, ...]], Any]] = None,
+            output: str = 'dict',
+            trusted: bool = False,
+            inplace: Union[bool, str] = False,
+            deadline: Optional[float] = None,
+            max_ops: Optional[int] = None,
+            lazy: bool = False,
+            unique: bool = False,
+            unique_by: Tuple[str, ...] = ()):
         self.data = data
         self.rules = rules
+        self.sample = sample
+        self.keys = {}
+
+        # deadline: Seconds the verification may take.
+        # max_ops: Number of fields that may be verified.
+        # Both are checked at every record and field, a ValidationTimeout
+        # carrying the progress is raised when one of them is exceeded.
+        self.budgeted = deadline is not None or max_ops is not None
+        self.started = time.monotonic()
+        self.deadline = None if deadline is None else self.started + deadline
+        self.max_ops = max_ops
+        self.ops = 0
+        self.records = 0
+
+        # trusted: Skip every check and custom function, only apply the
+        # default values and type conversion of the rules.
+        self.trusted = trusted
+        self.plans = {}
+        self.orders = {}
+
+        # Plans of the rules verified without any optional feature, see verify.
+        self.fast = False
+        self.fast_plans = {}
+
+        # output: 'dict' returns dicts, 'record' returns compact Record
+        # tuples and 'batch' additionally stores a many=True result in a
+        # column oriented RecordBatch. 'json' returns the UTF-8 JSON bytes
+        # of the dicts, one line per record for many=True.
+        if output not in ('dict', 'record', 'batch', 'json'):
+            raise ValueError(f'Unknown output {output!r}.')
+        self.output = output
+
+        # Reuse the result of equal records or field values instead of
+        # verifying them again. The reused results are copied unless
+        # dedup is 'share', in which case they must be treated as read-only.
+        self.dedup = dedup
+        self.dedup_fields = frozenset(dedup_fields)
+        self.memo = {}
+
+        # inplace: Write the verified values back into the dicts and lists
+        # of the data instead of copying them. When verification fails the
+        # data is left partially modified, unless inplace is 'rollback', in
+        # which case every write is journaled and undone before raising.
+        if inplace and (output != 'dict' or dedup):
+            raise ValueError('inplace can only be used with dict output and without dedup.')
+        self.inplace = inplace
+        self.journal = [] if inplace == 'rollback' else None
+
+        # lazy: Return LazyParams that only check the required fields up
+        # front and verify every other field on its first access. The
+        # deadline and max_ops budgets only bound the checks up front.
+        if lazy and (output != 'dict' or trusted or sample is not None or inplace or dedup or dedup_fields):
+            raise ValueError('lazy can only be used with dict output and without trusted, sample, inplace or dedup.')
+        self.lazy = lazy
+
+        # unique: Reject equal records of a many=True batch.
+        # unique_by: Reject records with the same values of these keys.
+        if lazy and unique:
+            raise ValueError('unique compares whole records, use unique_by with lazy.')
+        self.unique = unique
+        self.unique_by = tuple(unique_by)
+
+        # Top level rules whose batch_func runs once over a many=True batch,
+        # and the values collected for them as (record index, value).
+        self.deferred = {}
+        self.pending = {}
+
+        # Whether the sampler leaves the invalid records out of a many=True
+        # result instead of stopping it.
+        self.drop = False
+
+        # Bound the size of the data before any rule is executed.
+        if max_depth is not None or max_total_nodes is not None:
+            self.verify_size(data, max_depth, max_total_nodes)
+
+        if self.journal is None:
+            self.params = self.run(data, rules, many, prefetch)
+        else:
+            try:
+                self.params = self.run(data, rules, many, prefetch)
+            except BaseException:
+                # Custom functions may raise anything, undo the writes whatever it is.
+                self.rollback()
+                raise
+            self.journal = None
+        if lazy:
+            self.budgeted = False
+
+    def run(self, data, rules: Dic[str, RuleBase], many: bool, prefetch):
 
         # If set to True, the data to be verified is cyclic data.
         if many:
-            verify_data = []
-
             if not isinstance(data, (list, set, tuple)):
                 raise ValidationError(msg.message.many)
 
-            for _data in data:
-                verify_data.append(self.verify(_data, rules))
+            # Let the caller load the attributes of all objects at once,
+            # e.g. the lazy relationships of ORM rows.
+            if prefetch is not None:
+                prefetch(list(data), self.get_keys(rules))
+
+            if self.dedup:
+                records = self.verify_distinct(data, rules)
+            else:
+                # Execute each batch_func once with the values of all records.
+                if isinstance(rules, dict) and not self.lazy:
+                    self.deferred = {key: rule for key, rule in rules.items() if getattr(rule, 'batch_func', None)}
+                self.fast = self.is_fast()
+                plain = self.fast and self.sample is None and not self.trusted and not self.lazy
+                verify = self.verify if plain else self.verify_record
+                records = (verify(_data, rules) for _data in data)
+
+            self.drop = self.sample is not None and self.sample.on_violation != 'raise'
+            if self.drop:
+                records = (record for record in records if record is not _rejected)
+
+            if self.deferred:
+                records = self.resolve(list(records))
+
+            if (self.unique or self.unique_by) and not self.trusted:
+                records = list(records)
+                self.verify_unique(records)
+
+            if self.output == 'batch':
+                if isinstance(rules, OneOf):
+                    raise ValueError('batch output needs the same keys in every record.')
+                return RecordBatch.from_records(self.get_keys(rules), records)
+            if self.output == 'json':
+                return dumps_lines(records)
+            return self.assign(data, list(records))
+
+        if prefetch is not None:
+            prefetch([data], self.get_keys(rules))
+        self.fast = self.is_fast()
+        if self.output == 'json':
+            return dumps(self.verify_record(data, rules))
+        return self.verify_record(data, rules)
+
+    def defer(self, key: str, rule: RuleBase, value):
+        """Verify the value and keep it for the batch_func of the whole batch."""
+        value = rule.execute_parse(key, value, batch=False)
+        self.pending.setdefault(key, []).append((self.records, value))
+        return value
+
+    def resolve(self, records: list) -> list:
+        """Execute the deferred batch functions and write their results back."""
+        updates = []
+        for key, items in self.pending.items():
+            rule = self.deferred[key]
+            positions, values = [], []
+            for index, value in items:
+                if not rule.multi:
+                    positions.append((index, None))
+                    values.append(value)
+                elif isinstance(value, list):
+                    positions.extend((index, i) for i in range(len(value)))
+                    values.extend(value)
+            updates.append((key, positions, rule.execute_batch_func(key, values)))
+
+        # Only write once every batch function has succeeded.
+        keys = self.get_keys(self.rules)
+        for key, positions, results in updates:
+            for (index, i), result in zip(positions, results):
+                record = records[index]
+                if i is not None:
+                    record[key][i] = result
+                elif isinstance(record, dict):
+                    record[key] = result
+                else:
+                    values = list(record)
+                    values[keys.index(key)] = result
+                    records[index] = type(record)(values)
+        return records
+
+    def verify_unique(self, records: list):
+        """Check that the records of the batch are not duplicated."""
+        if self.unique_by:
+            records = [tuple(record.get(key) for key in self.unique_by) for record in records]
+        duplicates = find_duplicates(records)
+        if duplicates:
+            raise ValidationError(msg.message.unique_many.format(duplicates=duplicates))
+
+    def verify_distinct(self, data: Union[list, set, tuple], rules: Dic[str, RuleBase]):
+        """Verify each distinct record once, keeping the original order."""
+        seen = {}
+        for _data in data:
+            try:
+                fp = fingerprint(_data)
+            except TypeError:
+                yield self.verify_record(_data, rules)
+                continue
+            if fp in seen:
+                yield self.reuse(seen[fp])
+            else:
+                record = self.verify_record(_data, rules)
+                # A rejected record is verified again, so each copy is counted.
+                if record is not _rejected:
+                    seen[fp] = record
+                yield record
+
+    def reuse(self, value):
+        return value if self.dedup == 'share' else copy_containers(value)
+
+    def execute_parse(self, key: str, rule: RuleBase, value):
+        """Execute a rule, remembering its result when the field is deduplicated."""
+        if key not in self.dedup_fields:
+            return self.assign(value, rule.execute_parse(key, value))
+        try:
+            memo_key = (id(rule), fingerprint(value))
+        except TypeError:
+            return rule.execute_parse(key, value)
+        if memo_key in self.memo:
+            return self.reuse(self.memo[memo_key])
+        self.memo[memo_key] = rule.execute_parse(key, value)
+        return self.memo[memo_key]
+
+    def verify_record(self, data: Union[dict, list, set, tuple], rules: Dic[str, RuleBase]):
+        """Verify one record, or only convert it when the sampler skips it."""
+        if self.budgeted:
+            self.check_budget()
+
+        if self.lazy:
+            verify_data = LazyParams(self, data, rules)
+        elif self.sample is None:
+            verify_data = self.coerce(data, rules) if self.trusted else self.verify(data, rules)
         else:
-            verify_data = self.verify(data, rules)
+            verified = not self.trusted and self.sample.should_verify()
+            mark = 0 if self.journal is None else len(self.journal)
+            try:
+                verify_data = self.verify(data, rules) if verified else self.coerce(data, rules)
+            except ValidationTimeout:
+                raise
+            except ValidationError as e:
+                # A record whose type conversion fails is a violation too.
+                self.sample.record(False)
+                if not self.drop:
+                    raise
+                self.reject(data, e, mark)
+                return _rejected
+            if verified:
+                self.sample.record(True)
+
+        self.records += 1
+        return verify_data
+
+    def reject(self, data, error: ValidationError, mark: int):
+        """Leave out a record, dropping its deferred values and inplace writes."""
+        for key, items in self.pending.items():
+            if items and items[-1][0] == self.records:
+                self.pending[key] = [item for item in items if item[0] != self.records]
+        if self.journal is not None:
+            self.undo(mark)
+        self.sample.reject(data, error)
 
-        self.params = verify_data
+    def check_budget(self):
+        """Raise a ValidationTimeout once the time or operation budget is spent."""
+        if (self.max_ops is not None and self.ops > self.max_ops) or \
+                (self.deadline is not None and time.monotonic() > self.deadline):
+            raise ValidationTimeout(
+                msg.message.timeout.format(records=self.records, ops=self.ops),
+                records=self.records, ops=self.ops, elapsed=time.monotonic() - self.started)
+
+    def is_fast(self) -> bool:
+        """Whether no option needs the per field bookkeeping of verify."""
+        return not (self.budgeted or self.inplace or self.dedup_fields or self.deferred) and \
+            self.output in ('dict', 'json')
+
+    def get_fast_plan(self, rules: Dic[str, RuleBase]) -> Optional[list]:
+        """The plan of rules without conditional rules, None otherwise."""
+        plan = None
+        if not isinstance(rules, OneOf):
+            plan = self.get_plan(rules)
+            if any(kind is _WHEN for _, _, kind, _ in plan):
+                plan = None
+        self.fast_plans[id(rules)] = plan
+        return plan
 
     def verify(self, data: Union[dict, list, set, tuple], rules: Dic[str, RuleBase]):
 
-        verify_data = {}
+        # Without optional features, each field is read and verified directly.
+        if self.fast:
+            try:
+                plan = self.fast_plans[id(rules)]
+            except KeyError:
+                plan = self.get_fast_plan(rules)
+            if plan is not None:
+                verify_data = {}
+                if isinstance(data, dict):
+                    get = data.get
+                    for key, rule, kind, _ in plan:
+                        if kind is _VALUE:
+                            verify_data[key] = rule.execute_parse(key, get(key, unset))
+                        else:
+                            verify_data[key] = self.verify_field(key, rule, get(key, unset))
+                else:
+                    for (key, rule, kind, _), value in zip(plan, self.extract(data, rules)):
+                        if kind is _VALUE:
+                            verify_data[key] = rule.execute_parse(key, value)
+                        else:
+                            verify_data[key] = self.verify_field(key, rule, value)
+                return verify_data
+
+        # A discriminated union picks the rule structure of the record.
+        if isinstance(rules, OneOf):
+            rules = rules.select(rules.discriminator, data)
+
+        plan = self.get_plan(rules)
+        verify_values = [_pending] * len(plan)
+        skipped = False
+        deferred = self.deferred if rules is self.rules else None
+
+        # If it is not a dictionary, the corresponding value is obtained by reflection.
+        values = self.extract(data, rules)
 
-        for key, rule in rules.items():
+        for i in self.get_order(rules):
+            key, rule, kind, _ = plan[i]
 
-            # If it is not a dictionary, the corresponding value is obtained by reflection.
-            if isinstance(data, dict):
-                value = data.get(key, unset)
+            # Conditional rules are only evaluated when their condition holds.
+            if kind is _WHEN:
+                if not rule.match(self.condition(data, rules, verify_values, rule.key)):
+                    verify_values[i] = _skipped
+                    skipped = True
+                    continue
+                rule = rule.rule
+
+            if self.budgeted:
+                self.ops += 1
+                self.check_budget()
+
+            if deferred and key in deferred:
+                verify_values[i] = self.defer(key, rule, values[i])
             else:
-                value = getattr(data, key, unset)
+                verify_values[i] = self.verify_field(key, rule, values[i])
+
+        return self.build(rules, verify_values, data, skipped)
+
+    def verify_field(self, key: str, rule: RuleBase, value):
+
+        # Nested structure processing, triggering recursive parsing results.
+        if isinstance(rule, List):
+            if not isinstance(value, (list, set, tuple)):
+                raise ValidationError(msg.message.multi.format(key=key, value=value))
+            rule.verify_items(key, value)
+            if rule.dest is True:
+                return value
+            rule.common_rules_verify(key, value)
+            items = [self.verify(_value, rule.subset) for _value in value]
+            if rule.unique or rule.unique_by:
+                rule.verify_unique(key, items, rule.unique_by)
+            return self.assign(value, items)
+
+        elif isinstance(rule, Dict):
+            if rule.dest is True:
+                return value
+            rule.common_rules_verify(key, value)
+            return self.verify(value, rule.subset)
+
+        elif isinstance(rule, OneOf):
+            value = rule.common_rules_verify(key, value)
+            if value is None:
+                return value
+            if not rule.multi:
+                return self.verify(value, rule.select(key, value))
+            if not isinstance(value, (list, set, tuple)):
+                raise ValidationError(msg.message.multi.format(key=key, value=value))
+            rule.verify_items(key, value)
+            return self.assign(value, [self.verify(_value, rule.select(key, _value)) for _value in value])
+
+        # Data rule analysis.
+        return self.execute_parse(key, rule, value)
+
+    def coerce(self, data: Union[dict, list, set, tuple], rules: Dic[str, RuleBase]):
+        """Apply the default values and type conversion of the rules only."""
+
+        if isinstance(rules, OneOf):
+            rules = rules.select(rules.discriminator, data)
+
+        plan = self.get_plan(rules)
+        coerce_values = [_pending] * len(plan)
+        skipped = False
+        values = self.extract(data, rules)
 
-            # Nested structure processing, triggering recursive parsing results.
-            if isinstance(rule, List):
+        for i in self.get_order(rules):
+            key, rule, kind, subset = plan[i]
+            value = values[i]
+
+            if kind is _WHEN:
+                if not rule.match(self.condition(data, rules, coerce_values, rule.key)):
+                    coerce_values[i] = _skipped
+                    skipped = True
+                    continue
+                key, rule, kind, subset = subset
+
+            if self.budgeted:
+                self.ops += 1
+                self.check_budget()
+
+            if kind is _VALUE:
+                coerce_values[i] = self.assign(value, rule.execute_coerce(key, value))
+                continue
+
+            value = rule.set_default_value(value)
+            if kind is _RAW or value in rule.null_values:
+                value = None if isinstance(value, Unset) else value
+            elif kind is _LIST or (kind is _ONEOF and rule.multi):
                 if not isinstance(value, (list, set, tuple)):
                     raise ValidationError(msg.message.multi.format(key=key, value=value))
-                if rule.dest is True:
-                    verify_data[key] = value
-                    continue
-                rule.common_rules_verify(key, value)
-                verify_values = []
-                for _value in value:
-                    verify_values.append(self.verify(_value, rule.subset))
-                verify_data[key] = verify_values
-
-            elif isinstance(rule, Dict):
-                if rule.dest is True:
-                    verify_data[key] = value
-                    continue
-                rule.common_rules_verify(key, value)
-                verify_data[key] = self.verify(value, rule.subset)
+                if kind is _LIST:
+                    value = self.assign(value, [self.coerce(_value, subset) for _value in value])
+                else:
+                    value = self.assign(value, [self.coerce(_value, rule.select(key, _value)) for _value in value])
+            elif kind is _ONEOF:
+                value = self.coerce(value, rule.select(key, value))
+            else:
+                value = self.coerce(value, subset)
+            coerce_values[i] = value
+
+        return self.build(rules, coerce_values, data, skipped)
+
+    def get_plan(self, rules: Dic[str, RuleBase]) -> list:
+        """Precompute how each rule is coerced, once per rule set."""
+        try:
+            return self.plans[id(rules)]
+        except KeyError:
+            pass
+
+        plan = self.plans[id(rules)] = [self.plan_rule(key, rule) for key, rule in rules.items()]
+        return plan
 
-            # Data rule analysis.
+    def get_order(self, rules: Dic[str, RuleBase]) -> list:
+        """Order in which the rules are evaluated, conditional rules last.
+
+        The conditions are then matched against the verified values of the
+        other keys instead of their raw input.
+        """
+        try:
+            return self.orders[id(rules)]
+        except KeyError:
+            pass
+
+        plan = self.get_plan(rules)
+        order = [i for i, entry in enumerate(plan) if entry[2] is not _WHEN]
+        order += [i for i, entry in enumerate(plan) if entry[2] is _WHEN]
+        self.orders[id(rules)] = order
+        return order
+
+    @staticmethod
+    def plan_rule(key: str, rule: RuleBase) -> tuple:
+        if isinstance(rule, When):
+            return key, rule, _WHEN, Verify.plan_rule(key, rule.rule)
+        if isinstance(rule, (List, Dict)) and rule.dest is True:
+            return key, rule, _RAW, None
+        if isinstance(rule, List):
+            return key, rule, _LIST, rule.subset
+        if isinstance(rule, Dict):
+            return key, rule, _DICT, rule.subset
+        if isinstance(rule, OneOf):
+            return key, rule, _ONEOF, None
+        return key, rule, _VALUE, None
+
+    def build(self, rules: Dic[str, RuleBase], values: list, data=None, skipped: bool = False):
+        """Assemble the verified values of one record in the requested output.
+
+        Fields of conditional rules that were not selected are left out of
+        dicts, removed from the data in inplace mode and set to None in
+        records.
+        """
+        keys = self.get_keys(rules)
+        if self.output in ('record', 'batch'):
+            if skipped:
+                values = [None if value is _skipped else value for value in values]
+            return record_type(keys)(values)
+
+        if self.inplace and isinstance(data, dict) and skipped:
+            # Remove the unverified input of the skipped fields, like dict output.
+            for key, value in zip(keys, values):
+                if value is _skipped and key in data:
+                    if self.journal is not None:
+                        self.journal.append((data, key, data[key]))
+                    del data[key]
+
+        if skipped:
+            keys = [key for key, value in zip(keys, values) if value is not _skipped]
+            values = [value for value in values if value is not _skipped]
+
+        if not (self.inplace and isinstance(data, dict)):
+            return dict(zip(keys, values))
+
+        for key, value in zip(keys, values):
+            old = data.get(key, _missing)
+            if old is not value:
+                if self.journal is not None:
+                    self.journal.append((data, key, old))
+                data[key] = value
+        return data
+
+    def assign(self, original, values):
+        """Write a verified list back into the original list in inplace mode."""
+        if not (self.inplace and isinstance(original, list) and isinstance(values, list)) or original is values:
+            return values
+        if self.journal is not None:
+            self.journal.append((original, slice(None), original[:]))
+        original[:] = values
+        return original
+
+    def rollback(self):
+        """Undo the writes of the inplace mode, latest first."""
+        self.undo(0)
+        self.journal = None
+
+    def undo(self, mark: int):
+        """Undo the writes journaled after mark, latest first."""
+        for container, key, old in reversed(self.journal[mark:]):
+            if old is _missing:
+                del container[key]
             else:
-                verify_data[key] = rule.execute_parse(key, value)
+                container[key] = old
+        del self.journal[mark:]
 
-        return verify_data
+    def get_keys(self, rules: Dic[str, RuleBase]) -> Tuple[str, ...]:
+        try:
+            return self.keys[id(rules)]
+        except KeyError:
+            pass
+        if isinstance(rules, OneOf):
+            keys = tuple(dict.fromkeys(key for subset in rules.choices.values() for key in subset))
+        else:
+            keys = tuple(rules)
+        self.keys[id(rules)] = keys
+        return keys
+
+    @staticmethod
+    def sibling(data: Any, key: str):
+        """Read the raw value of another key of the record."""
+        return get_extractor(type(data), (key,))(data)[0]
+
+    def condition(self, data: Any, rules: Dic[str, RuleBase], values: list, key: str):
+        """Value a conditional rule is matched against.
+
+        It is the verified value of the key when the key has a rule, None
+        when that rule was itself skipped, and the raw value otherwise.
+        """
+        keys = self.get_keys(rules)
+        if key in keys:
+            value = values[keys.index(key)]
+            if value is _skipped:
+                return None
+            if value is not _pending:
+                return value
+        return self.sibling(data, key)
+
+    def extract(self, data: Any, rules: Dic[str, RuleBase]) -> tuple:
+        """Read the values of the rules from the data, in the order of the rules."""
+        return get_extractor(type(data), self.get_keys(rules))(data)
+
+    @staticmethod
+    def verify_size(data, max_depth: Optional[int], max_total_nodes: Optional[int]):
+        """Check the nesting depth and the total number of items of the data.
+
+        Containers are counted by their length before their items are
+        visited, so an oversized payload is rejected without walking it.
+        """
+        nodes = 0
+        stack = [(data, 1)]
+        while stack:
+            value, depth = stack.pop()
+            if isinstance(value, dict):
+                items = value.values()
+            elif isinstance(value, (list, set, tuple)):
+                items = value
+            else:
+                continue
+
+            if max_depth is not None and depth > max_depth:
+                raise ValidationError(msg.message.max_depth.format(max_depth=max_depth))
+            if max_total_nodes is not None:
+                nodes += len(items)
+                if nodes > max_total_nodes:
+                    raise ValidationError(msg.message.max_total_nodes.format(max_total_nodes=max_total_nodes))
+
+            for item in items:
+                if isinstance(item, (dict, list, set, tuple)):
+                    stack.append((item, depth + 1))